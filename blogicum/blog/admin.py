@@ -1,17 +1,95 @@
 from django.contrib import admin
 
+from .cache import FEED_GROUP
+from .counters import recount_comments
 from .models import Category, Location, Post, Comment
+from .paginators import EstimatedCountPaginator
+from .search import get_search_backend, search_terms
+
+
+class EstimatedCountAdmin(admin.ModelAdmin):
+    """Список объектов большой таблицы без COUNT(*) на каждой странице."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_paginator(
+            self,
+            request,
+            queryset,
+            per_page,
+            orphans=0,
+            allow_empty_first_page=True):
+        return self.paginator(
+            queryset,
+            per_page,
+            cache_groups=(FEED_GROUP,),
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+        )
 
 
-@admin.register(Category, Location, Comment)
 class PostInfoAdmin(admin.ModelAdmin):
-    pass
+    list_filter = ('is_published',)
+
+
+@admin.register(Category)
+class CategoryAdmin(PostInfoAdmin):
+    list_display = ('title', 'slug', 'is_published', 'published_posts_count')
+    search_fields = ('title', 'slug')
+
+
+@admin.register(Location)
+class LocationAdmin(PostInfoAdmin):
+    list_display = ('name', 'is_published')
+    search_fields = ('name',)
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
-    list_display = ('title', 'comments_count')
+class PostAdmin(EstimatedCountAdmin):
+    list_display = (
+        'title',
+        'author',
+        'category',
+        'location',
+        'pub_date',
+        'is_published',
+        'is_live',
+        'comment_count',
+    )
+    list_select_related = ('author', 'category', 'location')
+    list_filter = ('is_published', 'is_live', 'category', 'pub_date')
+    search_fields = ('title', 'text')
+    raw_id_fields = ('author',)
+
+    def get_search_results(self, request, queryset, search_term):
+        terms = search_terms(search_term)
+        if not terms:
+            return queryset, False
+        return get_search_backend().search(queryset, terms), False
+
+
+@admin.register(Comment)
+class CommentAdmin(EstimatedCountAdmin):
+    list_display = ('__str__', 'post', 'author', 'created_at')
+    list_select_related = ('post', 'author')
+    list_filter = ('created_at',)
+    search_fields = ('=author__username', 'text')
+    raw_id_fields = ('post', 'author')
+    ordering = ('-created_at', '-pk')
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        post_ids = {obj.post_id}
+        if change and 'post' in form.changed_data:
+            post_ids.add(form.initial['post'])
+        recount_comments(Post.objects.filter(pk__in=post_ids))
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        recount_comments(Post.objects.filter(pk=obj.post_id))
 
-    @admin.display(description='Количество комментариев')
-    def comments_count(self, obj):
-        return obj.comments.count()
+    def delete_queryset(self, request, queryset):
+        post_ids = set(queryset.values_list('post_id', flat=True))
+        super().delete_queryset(request, queryset)
+        recount_comments(Post.objects.filter(pk__in=post_ids))
@@ -0,0 +1,292 @@
+import json
+from typing import Any, Iterator, Union
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Case, Expression, F, When
+from django.db.models.query import QuerySet
+from django.http import (Http404, HttpRequest, HttpResponse, JsonResponse,
+                         StreamingHttpResponse)
+from django.urls import reverse
+from django.views.generic import View
+
+from blogicum.constants import (API_MAX_PAGE_SIZE, DUMP_BATCH_SIZE,
+                                POSTS_BY_PAGE)
+from .cache import FEED_GROUP, category_group, post_group, profile_group
+from .models import Category, Comment, Post
+from .paginators import CursorPaginator
+from .views import ConditionalGetMixin
+
+User = get_user_model()
+
+Field = Union[str, Expression]
+
+POST_FIELDS: dict[str, Field] = {
+    'id': 'pk',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': Case(
+        When(location__is_published=True, then=F('location__name')),
+    ),
+    'image': 'image',
+    'comment_count': 'comment_count',
+}
+COMMENT_FIELDS: dict[str, Field] = {
+    'id': 'pk',
+    'text': 'text',
+    'author': 'author__username',
+    'created_at': 'created_at',
+}
+CATEGORY_FIELDS: dict[str, Field] = {
+    'slug': 'slug',
+    'title': 'title',
+    'description': 'description',
+    'post_count': 'published_posts_count',
+}
+CONVERTERS = {
+    'image': lambda name: default_storage.url(name) if name else None,
+}
+
+
+class ApiError(Exception):
+    """Ошибка в параметрах запроса к API."""
+
+    status = 400
+
+
+class ApiNotFound(ApiError):
+    """Запрошенный объект не найден или скрыт."""
+
+    status = 404
+
+
+def dumps(data: Any) -> str:
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+class ApiView(ConditionalGetMixin, View):
+    """Представление API только для чтения."""
+
+    http_method_names = ('get', 'head', 'options')
+    cache_groups = (FEED_GROUP,)
+    fields = POST_FIELDS
+
+    def get_cache_groups(self) -> tuple[str, ...]:
+        return self.cache_groups
+
+    def dispatch(
+            self,
+            request: HttpRequest,
+            *args: Any,
+            **kwargs: Any) -> HttpResponse:
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return self.error(str(error), error.status)
+        except Http404:
+            return self.error('Не найдено.', 404)
+
+    def error(self, detail: str, status: int) -> JsonResponse:
+        """Ошибка в едином для всех эндпоинтов формате."""
+        return JsonResponse(
+            {'detail': detail},
+            status=status,
+            json_dumps_params={'ensure_ascii': False},
+        )
+
+    def http_method_not_allowed(
+            self,
+            request: HttpRequest,
+            *args: Any,
+            **kwargs: Any) -> HttpResponse:
+        response = self.error(
+            f'Метод {request.method} не поддерживается.',
+            405,
+        )
+        response['Allow'] = ', '.join(self._allowed_methods())
+        return response
+
+    def get_fields(self) -> dict[str, Field]:
+        """Поля, выбранные параметром ``fields``."""
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return self.fields
+        names = [name for name in requested.split(',') if name]
+        unknown = set(names) - set(self.fields)
+        if unknown:
+            raise ApiError(f'Неизвестные поля: {", ".join(sorted(unknown))}')
+        return {name: self.fields[name] for name in names}
+
+    def project(self, queryset: QuerySet, *keys: str) -> QuerySet:
+        """Выборка только нужных колонок без создания моделей."""
+        self.lookups = {}
+        annotations = {}
+        for name, source in self.get_fields().items():
+            if isinstance(source, str):
+                self.lookups[name] = source
+            else:
+                self.lookups[name] = f'api_{name}'
+                annotations[self.lookups[name]] = source
+        return queryset.annotate(**annotations).values(
+            *keys,
+            *self.lookups.values(),
+        )
+
+    def serialize(self, row: dict) -> dict:
+        data = {}
+        for name, lookup in self.lookups.items():
+            value = row[lookup]
+            converter = CONVERTERS.get(name)
+            data[name] = converter(value) if converter else value
+        return data
+
+
+class PostListApiView(ApiView):
+    """Лента публикаций с курсорной пагинацией."""
+
+    def get_queryset(self) -> QuerySet:
+        return Post.published_posts.all()
+
+    def get_page_size(self) -> int:
+        try:
+            limit = int(self.request.GET.get('limit', POSTS_BY_PAGE))
+        except ValueError:
+            raise ApiError('Параметр limit должен быть числом.')
+        return min(max(limit, 1), API_MAX_PAGE_SIZE)
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any):
+        paginator = CursorPaginator(
+            self.project(self.get_queryset(), 'pk', 'pub_date'),
+            self.get_page_size(),
+        )
+        try:
+            page = paginator.page(
+                after=request.GET.get('after'),
+                before=request.GET.get('before'),
+            )
+        except InvalidPage as error:
+            raise ApiError(str(error))
+        return JsonResponse(
+            {
+                'results': [self.serialize(row) for row in page],
+                'next': self.page_url('after', page.next_cursor),
+                'previous': self.page_url('before', page.previous_cursor),
+            },
+            json_dumps_params={'ensure_ascii': False},
+        )
+
+    def page_url(self, direction: str, cursor: str):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        query[direction] = cursor
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{query.urlencode()}'
+        )
+
+
+class CategoryPostListApiView(PostListApiView):
+    """Публикации категории."""
+
+    def get_cache_groups(self) -> tuple[str, ...]:
+        return (category_group(self.kwargs['category_slug']),)
+
+    def get_queryset(self) -> QuerySet:
+        category = Category.objects.filter(
+            slug=self.kwargs['category_slug'],
+            is_published=True,
+        ).values('pk').first()
+        if category is None:
+            raise ApiNotFound('Категория не найдена.')
+        return Post.published_posts.filter(category_id=category['pk'])
+
+
+class ProfilePostListApiView(PostListApiView):
+    """Публикации пользователя, автору видны и неопубликованные."""
+
+    def get_cache_groups(self) -> tuple[str, ...]:
+        return (profile_group(self.kwargs['username']),)
+
+    def get_queryset(self) -> QuerySet:
+        author = User.objects.filter(
+            username=self.kwargs['username'],
+        ).values('pk').first()
+        if author is None:
+            raise ApiNotFound('Пользователь не найден.')
+        queryset = Post.objects.filter(author_id=author['pk'])
+        if author['pk'] != self.request.user.pk:
+            queryset = queryset.published()
+        return queryset
+
+
+class PostDetailApiView(ApiView):
+    """Публикация."""
+
+    def get_cache_groups(self) -> tuple[str, ...]:
+        return (post_group(self.kwargs['post_id']),)
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any):
+        row = self.project(
+            Post.objects.visible_to(request.user),
+        ).filter(pk=self.kwargs['post_id']).first()
+        if row is None:
+            raise ApiNotFound('Публикация не найдена.')
+        data = self.serialize(row)
+        data['comments'] = request.build_absolute_uri(
+            reverse('api:comment_list', args=(self.kwargs['post_id'],)),
+        )
+        return JsonResponse(data, json_dumps_params={'ensure_ascii': False})
+
+
+class CommentListApiView(ApiView):
+    """Все комментарии публикации потоковым JSON-массивом."""
+
+    fields = COMMENT_FIELDS
+
+    def get_cache_groups(self) -> tuple[str, ...]:
+        return (post_group(self.kwargs['post_id']),)
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any):
+        post = Post.objects.visible_to(request.user).filter(
+            pk=self.kwargs['post_id'],
+        ).values('pk').first()
+        if post is None:
+            raise ApiNotFound('Публикация не найдена.')
+        rows = self.project(
+            Comment.objects.filter(post_id=post['pk']).order_by(
+                'created_at',
+                'pk',
+            ),
+        ).iterator(chunk_size=DUMP_BATCH_SIZE)
+        return StreamingHttpResponse(
+            self.stream(rows),
+            content_type='application/json',
+        )
+
+    def stream(self, rows: Iterator[dict]) -> Iterator[str]:
+        yield '['
+        for index, row in enumerate(rows):
+            yield (',' if index else '') + dumps(self.serialize(row))
+        yield ']'
+
+
+class CategoryListApiView(ApiView):
+    """Опубликованные категории."""
+
+    fields = CATEGORY_FIELDS
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any):
+        rows = self.project(
+            Category.objects.filter(is_published=True).order_by('title'),
+        )
+        return JsonResponse(
+            {'results': [self.serialize(row) for row in rows]},
+            json_dumps_params={'ensure_ascii': False},
+        )
@@ -0,0 +1,33 @@
+from django.urls import path
+
+from . import api
+
+app_name = 'api'
+urlpatterns = [
+    path('posts/', api.PostListApiView.as_view(), name='post_list'),
+    path(
+        'posts/<int:post_id>/',
+        api.PostDetailApiView.as_view(),
+        name='post_detail',
+    ),
+    path(
+        'posts/<int:post_id>/comments/',
+        api.CommentListApiView.as_view(),
+        name='comment_list',
+    ),
+    path(
+        'categories/',
+        api.CategoryListApiView.as_view(),
+        name='category_list',
+    ),
+    path(
+        'categories/<slug:category_slug>/posts/',
+        api.CategoryPostListApiView.as_view(),
+        name='category_posts',
+    ),
+    path(
+        'profiles/<slug:username>/posts/',
+        api.ProfilePostListApiView.as_view(),
+        name='profile_posts',
+    ),
+]
@@ -0,0 +1,62 @@
+import hashlib
+import time
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+FEED_GROUP = 'feed'
+
+
+def post_group(post_id: int) -> str:
+    return f'post:{post_id}'
+
+
+def category_group(slug: str) -> str:
+    return f'category:{slug}'
+
+
+def profile_group(username: str) -> str:
+    return f'profile:{username}'
+
+
+def _version_key(group: str) -> str:
+    return f'blog:version:{group}'
+
+
+def _new_version() -> str:
+    return str(time.time_ns())
+
+
+def get_versions(groups: Iterable[str]) -> list[str]:
+    """Текущие версии групп страниц, недостающие создаются."""
+    keys = [_version_key(group) for group in groups]
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*groups: str) -> None:
+    """Сбрасывает кэш страниц перечисленных групп."""
+    if groups:
+        cache.set_many(
+            {_version_key(group): _new_version() for group in set(groups)},
+            None,
+        )
+
+
+def invalidate_on_commit(*groups: str) -> None:
+    """Сбрасывает кэш групп после фиксации текущей транзакции.
+
+    Иначе другой процесс успел бы закэшировать под новой версией
+    страницу, собранную из ещё не зафиксированных данных.
+    """
+    transaction.on_commit(lambda: invalidate(*groups))
+
+
+def page_key(path: str, groups: Iterable[str]) -> str:
+    digest = hashlib.md5(path.encode()).hexdigest()
+    return f'blog:page:{digest}:{":".join(get_versions(groups))}'
@@ -0,0 +1,28 @@
+from collections import Counter
+
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.query import QuerySet
+
+from .models import Category, Comment
+
+
+def shift_published_counts(deltas: Counter) -> None:
+    """Сдвигает счётчики опубликованных записей категорий."""
+    for category_id, delta in deltas.items():
+        if category_id and delta:
+            Category.objects.filter(pk=category_id).update(
+                published_posts_count=Greatest(
+                    F('published_posts_count') + delta,
+                    0,
+                ),
+            )
+
+
+def recount_comments(posts: QuerySet) -> int:
+    """Пересчитывает хранимые счётчики комментариев публикаций."""
+    return posts.update(comment_count=Coalesce(Subquery(
+        Comment.objects.filter(
+            post=OuterRef('pk'),
+        ).values('post').annotate(total=Count('pk')).values('total'),
+    ), 0))
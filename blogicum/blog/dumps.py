@@ -0,0 +1,117 @@
+import gzip
+import json
+import re
+from datetime import datetime, time
+from pathlib import Path
+from typing import Iterator, TextIO
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.query import QuerySet
+
+READ_CHUNK_SIZE = 1 << 20
+GZIP_LEVEL = 6
+SEPARATOR_RE = re.compile(r'[\s,]*')
+
+
+def open_dump(path: str, mode: str = 'rt') -> TextIO:
+    """Открывает дамп, при расширении .gz — со сжатием gzip."""
+    if Path(path).suffix == '.gz':
+        return gzip.open(
+            path,
+            mode,
+            compresslevel=GZIP_LEVEL,
+            encoding='utf-8',
+        )
+    return open(path, mode, encoding='utf-8')
+
+
+def iter_dump(
+        stream: TextIO,
+        chunk_size: int = READ_CHUNK_SIZE) -> Iterator[dict]:
+    """Потоково разбирает JSON-массив или JSON Lines, не загружая целиком."""
+    decoder = json.JSONDecoder()
+    buffer = stream.read(chunk_size).lstrip()
+    array = buffer.startswith('[')
+    position = int(array)
+    eof = False
+    while True:
+        position = SEPARATOR_RE.match(buffer, position).end()
+        if array and buffer.startswith(']', position):
+            return
+        if position < len(buffer):
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield item
+                continue
+        elif eof:
+            if array:
+                raise ValueError('Дамп оборвался до конца JSON-массива.')
+            return
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def iter_records(queryset: QuerySet, chunk_size: int) -> Iterator[dict]:
+    """Потоково выдаёт объекты в формате ``dumpdata``."""
+    model = queryset.model
+    label = model._meta.label_lower
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if not field.primary_key
+        and (field.editable or getattr(field, 'auto_now_add', False))
+    ]
+    rows = queryset.order_by('pk').values_list(
+        'pk',
+        *[field.attname for field in fields],
+    ).iterator(chunk_size=chunk_size)
+    for pk, *values in rows:
+        yield {
+            'model': label,
+            'pk': pk,
+            'fields': {
+                field.name: value for field, value in zip(fields, values)
+            },
+        }
+
+
+class DumpEncoder(DjangoJSONEncoder):
+    """JSON без потери микросекунд во времени.
+
+    ``import_dump`` сопоставляет публикации и комментарии по времени,
+    поэтому округление до миллисекунд привело бы к дублям.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime, time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class DumpWriter:
+    """Запись дампа JSON-массивом или построчно (JSON Lines)."""
+
+    def __init__(self, stream: TextIO, json_lines: bool = False):
+        self.stream = stream
+        self.json_lines = json_lines
+        self.written = 0
+        if not json_lines:
+            self.stream.write('[')
+
+    def write(self, record: dict) -> None:
+        data = json.dumps(record, cls=DumpEncoder, ensure_ascii=False)
+        if self.json_lines:
+            self.stream.write(data + '\n')
+        else:
+            self.stream.write((',\n' if self.written else '\n') + data)
+        self.written += 1
+
+    def close(self) -> None:
+        if not self.json_lines:
+            self.stream.write('\n]\n')
@@ -0,0 +1,184 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Optional
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import Max
+from django.db.models.query import QuerySet
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date
+from django.utils.text import Truncator
+from django.views.decorators.http import condition
+
+from blogicum.constants import FEED_ITEMS, PAGE_CACHE_TIMEOUT
+from blogicum.metrics import inc
+from .cache import FEED_GROUP, category_group, get_versions, profile_group
+from .models import Category, Post
+
+User = get_user_model()
+
+
+class PostsFeed(Feed):
+    """RSS-лента последних публикаций."""
+
+    title = 'Блогикум'
+    description = 'Новые записи в Блогикуме.'
+    description_words = 50
+
+    def __call__(self, request, *args, **kwargs):
+        etag, last_modified = self.get_state(request.path, **kwargs)
+        view = condition(
+            etag_func=lambda *args, **kwargs: etag,
+            last_modified_func=lambda *args, **kwargs: last_modified,
+        )(super().__call__)
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200 and last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+    def get_cache_groups(self, **kwargs) -> tuple[str, ...]:
+        return (FEED_GROUP,)
+
+    def filter_posts(self, queryset: QuerySet, **kwargs) -> QuerySet:
+        return queryset
+
+    def get_state(
+            self,
+            path: str,
+            **kwargs) -> tuple[Optional[str], Optional[datetime]]:
+        """Метка ETag и дата последней публикации без обращения к БД."""
+        versions = ':'.join(get_versions(self.get_cache_groups(**kwargs)))
+        digest = hashlib.md5(path.encode()).hexdigest()
+        key = f'blog:feed:{digest}:{versions}'
+        state = cache.get(key)
+        inc(
+            'blog_cache_requests_total',
+            cache='feed',
+            result='miss' if state is None else 'hit',
+        )
+        if state is None:
+            state = self.filter_posts(
+                Post.published_posts.order_by(),
+                **kwargs,
+            ).aggregate(latest=Max('pub_date'))
+            cache.set(key, state, PAGE_CACHE_TIMEOUT)
+        latest = state['latest']
+        if latest is None:
+            return None, None
+        etag = hashlib.md5(
+            f'{versions}:{latest.isoformat()}'.encode(),
+        ).hexdigest()
+        return f'"{etag}"', latest
+
+    def link(self, obj: Any = None) -> str:
+        return reverse('blog:index')
+
+    def items(self, obj: Any = None) -> QuerySet:
+        return Post.published_posts.all()[:FEED_ITEMS]
+
+    def item_title(self, item: Post) -> str:
+        return item.title
+
+    def item_description(self, item: Post) -> str:
+        return Truncator(item.text).words(self.description_words)
+
+    def item_link(self, item: Post) -> str:
+        return reverse('blog:post_detail', args=(item.pk,))
+
+    def item_pubdate(self, item: Post) -> datetime:
+        return item.pub_date
+
+    def item_updateddate(self, item: Post) -> datetime:
+        return item.updated_at
+
+    def item_author_name(self, item: Post) -> str:
+        return item.author.get_full_name() or item.author.username
+
+    def item_author_link(self, item: Post) -> str:
+        return reverse('blog:profile', args=(item.author.username,))
+
+    def item_categories(self, item: Post) -> tuple[str, ...]:
+        return (item.category.title,) if item.category else ()
+
+
+class CategoryPostsFeed(PostsFeed):
+    """RSS-лента публикаций категории."""
+
+    def get_cache_groups(self, **kwargs) -> tuple[str, ...]:
+        return (category_group(kwargs['category_slug']),)
+
+    def filter_posts(self, queryset: QuerySet, **kwargs) -> QuerySet:
+        return queryset.filter(category__slug=kwargs['category_slug'])
+
+    def get_object(self, request, category_slug: str) -> Category:
+        return get_object_or_404(
+            Category,
+            slug=category_slug,
+            is_published=True,
+        )
+
+    def title(self, obj: Category) -> str:
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj: Category) -> str:
+        return obj.description
+
+    def link(self, obj: Category) -> str:
+        return reverse('blog:category_posts', args=(obj.slug,))
+
+    def items(self, obj: Category) -> QuerySet:
+        return Post.published_posts.filter(category=obj)[:FEED_ITEMS]
+
+
+class AuthorPostsFeed(PostsFeed):
+    """RSS-лента публикаций автора."""
+
+    def get_cache_groups(self, **kwargs) -> tuple[str, ...]:
+        return (profile_group(kwargs['username']),)
+
+    def filter_posts(self, queryset: QuerySet, **kwargs) -> QuerySet:
+        return queryset.filter(author__username=kwargs['username'])
+
+    def get_object(self, request, username: str) -> User:
+        return get_object_or_404(User, username=username)
+
+    def title(self, obj: User) -> str:
+        return f'Блогикум: {obj.get_full_name() or obj.username}'
+
+    def description(self, obj: User) -> str:
+        return f'Новые записи пользователя {obj.username}.'
+
+    def link(self, obj: User) -> str:
+        return reverse('blog:profile', args=(obj.username,))
+
+    def items(self, obj: User) -> QuerySet:
+        return Post.published_posts.filter(author=obj)[:FEED_ITEMS]
+
+
+class AtomPostsFeed(PostsFeed):
+    """Atom-лента последних публикаций."""
+
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class AtomCategoryPostsFeed(CategoryPostsFeed):
+    """Atom-лента публикаций категории."""
+
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj: Category) -> str:
+        return self.description(obj)
+
+
+class AtomAuthorPostsFeed(AuthorPostsFeed):
+    """Atom-лента публикаций автора."""
+
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj: User) -> str:
+        return self.description(obj)
@@ -0,0 +1,133 @@
+import statistics
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.client import Client
+from django.urls import reverse
+
+from blog.models import Comment, Post
+
+User = get_user_model()
+
+BENCH_USERNAME_PREFIX = 'bench_writer_'
+
+
+class Command(BaseCommand):
+    """Нагрузочный замер записи комментариев.
+
+    Потоки одновременно отправляют форму ``CommentCreateView`` через
+    тестовый клиент, каждый со своим соединением с базой. Конфигурации
+    сравниваются запуском команды с разными переменными окружения,
+    например ``SQLITE_JOURNAL_MODE=delete SQLITE_TRANSACTION_MODE=DEFERRED``.
+    Для замера создаётся временный пользователь с уникальным именем,
+    после замера удаляются он и только написанные им комментарии.
+    """
+
+    help = 'Замеряет пропускную способность параллельной записи комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=8,
+            help='Число одновременных авторов комментариев.',
+        )
+        parser.add_argument(
+            '--comments',
+            type=int,
+            default=50,
+            help='Сколько комментариев отправляет каждый поток.',
+        )
+
+    def handle(self, *args, **options):
+        post = Post.objects.published().order_by('-pk').only('pk').first()
+        if post is None:
+            raise CommandError('Нет опубликованных записей для замера.')
+        user = User.objects.create(
+            username=f'{BENCH_USERNAME_PREFIX}{uuid.uuid4().hex}',
+        )
+        try:
+            self.describe_database()
+            latencies, errors, elapsed = self.write_comments(
+                post, user, options,
+            )
+        finally:
+            Comment.objects.filter(author=user).delete()
+            user.delete()
+            Post.objects.filter(pk=post.pk).update(
+                comment_count=Comment.objects.filter(post=post).count(),
+            )
+
+        latencies.sort()
+        self.stdout.write(
+            f'Записано: {len(latencies)}, ошибок: {len(errors)}, '
+            f'{len(latencies) / elapsed:.1f} комментариев в секунду'
+        )
+        if latencies:
+            p95 = latencies[int(0.95 * (len(latencies) - 1))]
+            self.stdout.write(
+                f'Задержка p50 {statistics.median(latencies) * 1000:.1f} мс, '
+                f'p95 {p95 * 1000:.1f} мс'
+            )
+
+    def write_comments(self, post, user, options) -> tuple:
+        """Задержки успешных запросов, коды ошибок и общее время."""
+        latencies = []
+        errors = []
+        url = reverse('blog:add_comment', args=(post.pk,))
+        host = next(
+            (host for host in settings.ALLOWED_HOSTS if '*' not in host),
+            'localhost',
+        )
+
+        def write(number: int) -> None:
+            client = Client(raise_request_exception=False, HTTP_HOST=host)
+            client.force_login(user)
+            try:
+                for index in range(options['comments']):
+                    start = time.perf_counter()
+                    response = client.post(
+                        url,
+                        {'text': f'Замер {number}-{index}'},
+                    )
+                    elapsed = time.perf_counter() - start
+                    if response.status_code == 302:
+                        latencies.append(elapsed)
+                    else:
+                        errors.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=write, args=(number,))
+            for number in range(options['threads'])
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        return latencies, errors, elapsed
+
+    def describe_database(self) -> None:
+        settings_dict = connection.settings_dict
+        description = [
+            f'СУБД: {connection.vendor}',
+            f'CONN_MAX_AGE: {settings_dict["CONN_MAX_AGE"]}',
+        ]
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                journal_mode = cursor.fetchone()[0]
+            description += [
+                f'journal_mode: {journal_mode}',
+                'транзакции: '
+                f'{settings_dict.get("TRANSACTION_MODE") or "DEFERRED"}',
+            ]
+        self.stdout.write(', '.join(description))
@@ -0,0 +1,112 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import Category, Location, Post
+from blogicum.constants import POSTS_BY_PAGE
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """Планы и время запросов лент публикаций.
+
+    Чтобы сравнить планы до и после индексов, запустите команду
+    после ``migrate blog 0004`` и после ``migrate blog``.
+    """
+
+    help = 'Выводит планы и время запросов лент публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Сколько синтетических публикаций создать перед замером.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Размер пакета при создании публикаций.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Сколько раз выполнить каждый запрос.',
+        )
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self.seed(options['seed'], options['batch_size'])
+        category = Category.objects.filter(is_published=True).first()
+        author = User.objects.filter(author__isnull=False).first()
+        feeds = {
+            'Лента': Post.published_posts.all(),
+            'Категория': Post.published_posts.filter(category=category),
+            'Профиль': Post.published_posts.filter(author=author),
+        }
+        for name, queryset in feeds.items():
+            page = queryset[:POSTS_BY_PAGE]
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(page.explain())
+            page_time = self.measure(lambda: list(page.all()), options)
+            count_time = self.measure(queryset.count, options)
+            self.stdout.write(
+                f'страница: {page_time} мс, COUNT: {count_time} мс'
+            )
+
+    def measure(self, query, options) -> str:
+        timings = []
+        for _ in range(options['repeat']):
+            start = time.perf_counter()
+            query()
+            timings.append(time.perf_counter() - start)
+        return f'{min(timings) * 1000:.1f}'
+
+    def seed(self, total, batch_size):
+        authors = [
+            User.objects.get_or_create(username=f'explain_feeds_{number}')[0]
+            for number in range(20)
+        ]
+        categories = [
+            Category.objects.get_or_create(
+                slug=f'explain-feeds-{number}',
+                defaults={
+                    'title': f'Категория {number}',
+                    'description': 'Синтетическая категория.',
+                    'is_published': number != 0,
+                },
+            )[0]
+            for number in range(10)
+        ]
+        location, _ = Location.objects.get_or_create(name='Синтетика')
+        now = timezone.now()
+        created = 0
+        while created < total:
+            size = min(batch_size, total - created)
+            posts = []
+            for number in range(created, created + size):
+                pub_date = now - timedelta(
+                    minutes=random.randint(-10_000, 1_000_000),
+                )
+                posts.append(Post(
+                    title=f'Публикация {number}',
+                    text='Синтетический текст публикации.',
+                    pub_date=pub_date,
+                    is_live=pub_date <= now,
+                    is_published=random.random() > 0.05,
+                    author=random.choice(authors),
+                    category=random.choice(categories),
+                    location=location,
+                ))
+            with transaction.atomic():
+                Post.objects.bulk_create(posts)
+            created += size
+            self.stdout.write(f'Создано публикаций: {created}/{total}')
@@ -0,0 +1,252 @@
+import time
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.cache import (FEED_GROUP, category_group, invalidate_on_commit,
+                        post_group, profile_group)
+from blog.counters import recount_comments, shift_published_counts
+from blog.dumps import iter_dump, open_dump
+from blog.models import Post
+from blog.search import get_search_backend
+from blogicum.constants import DUMP_BATCH_SIZE
+
+# Проходы по дампу: объекты прохода ссылаются только на объекты
+# предыдущих проходов, поэтому порядок записей в дампе не важен.
+PASSES = (
+    ('auth.user', 'blog.category', 'blog.location'),
+    ('blog.post',),
+    ('blog.comment',),
+)
+LABELS = tuple(label for labels in PASSES for label in labels)
+
+# Поля, по которым объекты дампа сопоставляются с уже загруженными.
+# Первые два поля выбирают кандидатов запросом по индексу.
+MATCH_FIELDS = {
+    'auth.user': ('username',),
+    'blog.category': ('slug',),
+    'blog.location': ('name',),
+    'blog.post': ('author_id', 'pub_date', 'title'),
+    'blog.comment': ('post_id', 'author_id', 'created_at'),
+}
+
+# Модели, на объекты которых ссылаются следующие проходы.
+REFERENCED_LABELS = LABELS[:-1]
+
+
+class Command(BaseCommand):
+    """Потоковая загрузка дампа в формате ``db.json`` или JSON Lines.
+
+    Объекты сопоставляются с уже загруженными по полям ``MATCH_FIELDS``,
+    поэтому повторная и инкрементальная загрузка не создаёт дублей.
+    Каждый пакет записывается своей транзакцией вместе со счётчиками
+    и поисковым индексом затронутых публикаций: блокировка записи
+    не держится всю загрузку, а прерванную загрузку можно повторить.
+    """
+
+    help = (
+        'Потоково загружает пользователей, категории, местоположения, '
+        'публикации и комментарии из дампа в формате db.json.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Путь к дампу (.json или .jsonl, можно с .gz).',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DUMP_BATCH_SIZE,
+            help='Сколько объектов записывать одной транзакцией.',
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.ids = defaultdict(dict)
+        self.pending = defaultdict(list)
+        self.imported = Counter()
+        self.first_created_post = None
+        self.started = time.perf_counter()
+        for labels in PASSES:
+            with open_dump(options['path']) as stream:
+                for record in iter_dump(stream):
+                    if record['model'] in labels:
+                        self.add(record)
+            self.flush()
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено объектов: {sum(self.imported.values())} '
+            f'за {time.perf_counter() - self.started:.1f} с ('
+            + ', '.join(
+                f'{label}: {count}'
+                for label, count in self.imported.items()
+            )
+            + ')'
+        ))
+
+    def add(self, record: dict) -> None:
+        label = record['model']
+        obj = self.build(label, record['fields'])
+        if label == 'blog.post':
+            obj.is_live = obj.pub_date <= timezone.now()
+            obj.comment_count = 0
+        elif label == 'blog.category':
+            obj.published_posts_count = 0
+        self.pending[label].append((record['pk'], obj))
+        if len(self.pending[label]) >= self.batch_size:
+            self.flush()
+
+    def build(self, label: str, fields: dict):
+        model = apps.get_model(label)
+        values = {}
+        for field in model._meta.concrete_fields:
+            if field.primary_key or field.name not in fields:
+                continue
+            value = fields[field.name]
+            if field.is_relation:
+                related = field.related_model._meta.label_lower
+                if value is not None:
+                    try:
+                        value = self.ids[related][value]
+                    except KeyError:
+                        raise CommandError(
+                            f'{label}: нет объекта {related} с pk={value} '
+                            'ни в дампе, ни среди загруженных ранее.'
+                        )
+                values[field.attname] = value
+            else:
+                values[field.name] = field.to_python(value)
+        return model(**values)
+
+    def flush(self) -> None:
+        """Записывает накопленные объекты, каждую модель — транзакцией."""
+        for label in LABELS:
+            pending = self.pending.pop(label, [])
+            if pending:
+                with transaction.atomic():
+                    self.write(label, pending)
+        total = sum(self.imported.values())
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(
+            f'Записано объектов: {total} '
+            f'({total / max(elapsed, 1e-6):.0f} в секунду)'
+        )
+
+    def write(self, label: str, pending: list) -> None:
+        """Создаёт объекты пакета, которых ещё нет в базе."""
+        model = apps.get_model(label)
+        fields = MATCH_FIELDS[label]
+        existing = self.find_existing(model, fields, pending)
+        # Пакет пишется в транзакции, начатой с блокировкой записи,
+        # поэтому выданные здесь pk не займёт другой процесс.
+        next_pk = (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+        objs = []
+        for dump_pk, obj in pending:
+            key = tuple(getattr(obj, name) for name in fields)
+            if key not in existing:
+                obj.pk = existing[key] = next_pk
+                next_pk += 1
+                objs.append(obj)
+            if label in REFERENCED_LABELS:
+                self.ids[label][dump_pk] = existing[key]
+        if not objs:
+            return
+        created = [
+            (field, [getattr(obj, field.attname) for obj in objs])
+            for field in model._meta.concrete_fields
+            if getattr(field, 'auto_now_add', False)
+        ]
+        model.objects.bulk_create(objs)
+        for field, dates in created:
+            self.restore_dates(field, objs, dates)
+        self.reset_sequence(model)
+        if label == 'blog.post':
+            self.update_posts(objs)
+        elif label == 'blog.comment':
+            self.update_commented_posts(objs)
+        self.imported[label] += len(objs)
+
+    def find_existing(self, model, fields: tuple, pending: list) -> dict:
+        """Ключи уже загруженных объектов по значениям ``fields``."""
+        return {
+            tuple(key): pk
+            for pk, *key in model.objects.filter(**{
+                f'{name}__in': {getattr(obj, name) for _, obj in pending}
+                for name in fields[:2]
+            }).order_by('-pk').values_list('pk', *fields).iterator()
+        }
+
+    def update_posts(self, posts: list) -> None:
+        """Индекс, счётчики категорий и кэш для новых публикаций."""
+        get_search_backend().index_many(posts)
+        shift_published_counts(Counter(
+            post.category_id
+            for post in posts
+            if post.is_published and post.is_live
+        ))
+        if self.first_created_post is None:
+            self.first_created_post = posts[0].pk
+        self.invalidate_posts(
+            Post.objects.filter(pk__in=[post.pk for post in posts]),
+        )
+
+    def update_commented_posts(self, comments: list) -> None:
+        """Счётчики и кэш публикаций, к которым добавлены комментарии."""
+        posts = Post.objects.filter(
+            pk__in={comment.post_id for comment in comments},
+        )
+        recount_comments(posts)
+        self.invalidate_posts(posts)
+
+    def invalidate_posts(self, posts) -> None:
+        """Сбрасывает после фиксации пакета кэш страниц с публикациями.
+
+        Страницы публикаций, созданных этой загрузкой, ещё не могли
+        попасть в кэш, поэтому их группы не сбрасываются.
+        """
+        groups = {FEED_GROUP}
+        for post_id, username, slug in posts.values_list(
+            'pk',
+            'author__username',
+            'category__slug',
+        ).iterator():
+            groups.add(profile_group(username))
+            if slug:
+                groups.add(category_group(slug))
+            if (
+                self.first_created_post is None
+                or post_id < self.first_created_post
+            ):
+                groups.add(post_group(post_id))
+        invalidate_on_commit(*groups)
+
+    def restore_dates(self, field, objs: list, dates: list) -> None:
+        """Возвращает даты из дампа, заменённые ``auto_now_add``."""
+        quote = connection.ops.quote_name
+        model = field.model
+        params = [
+            (field.get_db_prep_value(date, connection), obj.pk)
+            for obj, date in zip(objs, dates)
+            if date is not None
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'UPDATE {quote(model._meta.db_table)} '
+                f'SET {quote(field.column)} = %s '
+                f'WHERE {quote(model._meta.pk.column)} = %s',
+                params,
+            )
+        for obj, date in zip(objs, dates):
+            if date is not None:
+                setattr(obj, field.attname, date)
+
+    def reset_sequence(self, model) -> None:
+        """Сдвигает последовательность после явно заданных pk."""
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+                cursor.execute(sql)
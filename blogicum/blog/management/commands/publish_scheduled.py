@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.scheduling import next_publication_date, publish_due_posts
+
+
+class Command(BaseCommand):
+    help = 'Переводит в эфир отложенные публикации, дата которых наступила.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Работать постоянно, просыпаясь к ближайшей публикации.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60,
+            help='Наибольшая пауза между проверками в секундах.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            published = publish_due_posts()
+            if published:
+                self.stdout.write(f'Опубликовано записей: {published}')
+            if not options['loop']:
+                return
+            time.sleep(self.get_delay(options['interval']))
+
+    def get_delay(self, interval: float) -> float:
+        next_date = next_publication_date()
+        if next_date is None:
+            return interval
+        delay = (next_date - timezone.now()).total_seconds()
+        return min(max(delay, 0), interval)
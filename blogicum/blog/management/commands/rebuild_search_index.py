@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import FEED_GROUP, invalidate
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Полностью перестраивает поисковый индекс публикаций.'
+
+    def handle(self, *args, **options):
+        indexed = get_search_backend().rebuild()
+        invalidate(FEED_GROUP)
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано публикаций: {indexed}'
+        ))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.counters import recount_comments
+from blog.models import Category, Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает хранимые счётчики комментариев публикаций '
+        'и опубликованных записей категорий.'
+    )
+
+    def handle(self, *args, **options):
+        posts = recount_comments(Post.objects.all())
+        categories = Category.objects.update(
+            published_posts_count=Coalesce(Subquery(
+                Post.objects.filter(
+                    category=OuterRef('pk'),
+                    is_published=True,
+                    is_live=True,
+                ).values('category').annotate(
+                    total=Count('pk'),
+                ).values('total'),
+            ), 0),
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано публикаций: {posts}, категорий: {categories}'
+        ))
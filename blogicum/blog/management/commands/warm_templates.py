@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from blogicum.warmup import uses_cached_loader, warm_templates
+
+
+class Command(BaseCommand):
+    help = 'Компилирует все шаблоны и показывает время компиляции каждого.'
+
+    def handle(self, *args, **options):
+        if not uses_cached_loader():
+            self.stderr.write(self.style.WARNING(
+                'Кэширующий загрузчик шаблонов выключен: скомпилированные '
+                'шаблоны не сохранятся (DJANGO_TEMPLATE_CACHE=1).'
+            ))
+        timings = warm_templates()
+        for name, seconds in sorted(
+            timings,
+            key=lambda timing: timing[1],
+            reverse=True,
+        ):
+            self.stdout.write(f'{seconds * 1000:>8.2f} мс  {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Скомпилировано шаблонов: {len(timings)} за '
+            f'{sum(seconds for _, seconds in timings) * 1000:.1f} мс'
+        ))
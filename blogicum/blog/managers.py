@@ -1,20 +1,34 @@
-from django.db.models import Manager, Count
+from django.db.models import Manager, Q
 from django.db.models.query import QuerySet
-from django.utils import timezone
 
 
-class PostManager(Manager):
-    def get_queryset(self) -> QuerySet:
-        return super().get_queryset().filter(
-            pub_date__lte=timezone.now(),
-            is_published=True,
-            category__is_published=True,
-        ).annotate(
-            comment_count=Count('comments')
-        ).select_related(
+def published_q() -> Q:
+    return Q(
+        is_live=True,
+        is_published=True,
+        category__is_published=True,
+    )
+
+
+class PostQuerySet(QuerySet):
+    def published(self) -> QuerySet:
+        return self.filter(published_q())
+
+    def visible_to(self, user) -> QuerySet:
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(published_q() | Q(author=user))
+
+    def with_related(self) -> QuerySet:
+        return self.select_related(
             'author',
             'category',
             'location',
-        ).order_by(
+        )
+
+
+class PostManager(Manager.from_queryset(PostQuerySet)):
+    def get_queryset(self) -> QuerySet:
+        return super().get_queryset().published().with_related().order_by(
             '-pub_date',
         )
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_is_live'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_variants_source',
+            field=models.CharField(blank=True, editable=False, max_length=256, verbose_name='Фото, для которого готовы уменьшенные копии'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:39
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_published_posts(apps, schema_editor):
+    Category = apps.get_model('blog', 'Category')
+    Post = apps.get_model('blog', 'Post')
+    Category.objects.update(published_posts_count=Coalesce(Subquery(
+        Post.objects.filter(
+            category=OuterRef('pk'),
+            is_published=True,
+            is_live=True,
+        ).values('category').annotate(total=Count('pk')).values('total'),
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_image_variants_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='published_posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Опубликованных записей'),
+        ),
+        migrations.RunPython(count_published_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:53
+
+import blog.models
+from django.db import migrations
+from django.db.models import F
+
+
+def copy_created_at(apps, schema_editor):
+    for model_name in ('Post', 'Comment'):
+        apps.get_model('blog', model_name).objects.update(
+            updated_at=F('created_at'),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=blog.models.ModificationDateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=blog.models.ModificationDateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+SEARCH_KEY_SQL = (
+    "CAST(strftime('%%s', pub_date) AS INTEGER) * 2147483648 + id"
+)
+
+
+def reindex(key_sql):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        schema_editor.execute('DELETE FROM blog_post_search')
+        schema_editor.execute(
+            'INSERT INTO blog_post_search (rowid, title, text) '
+            f'SELECT {key_sql}, title, text FROM blog_post'
+        )
+        schema_editor.execute(
+            "INSERT INTO blog_post_search (blog_post_search) "
+            "VALUES ('optimize')"
+        )
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(reindex(SEARCH_KEY_SQL), reindex('id')),
+    ]
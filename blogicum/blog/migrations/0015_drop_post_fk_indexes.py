@@ -0,0 +1,58 @@
+# Generated by Django 3.2.16 on 2026-10-18 07:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Индексы внешних ключей повторяют начало составных индексов
+# post_author_feed_idx и post_category_pub_date_idx.
+FIELDS = ('author', 'category')
+
+
+def drop_indexes(apps, schema_editor):
+    # AlterField на SQLite пересоздал бы всю таблицу публикаций.
+    model = apps.get_model('blog', 'Post')
+    for name in FIELDS:
+        column = model._meta.get_field(name).column
+        for index in schema_editor._constraint_names(
+            model, [column], index=True,
+        ):
+            schema_editor.execute(
+                schema_editor._delete_index_sql(model, index),
+            )
+
+
+def create_indexes(apps, schema_editor):
+    model = apps.get_model('blog', 'Post')
+    for name in FIELDS:
+        schema_editor.execute(schema_editor._create_index_sql(
+            model, fields=[model._meta.get_field(name)],
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0014_post_search_key'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(drop_indexes, create_indexes),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='post',
+                    name='author',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='author', to=settings.AUTH_USER_MODEL, verbose_name='Автор публикации'),
+                ),
+                migrations.AlterField(
+                    model_name='post',
+                    name='category',
+                    field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='category', to='blog.category', verbose_name='Категория'),
+                ),
+            ],
+        ),
+    ]
@@ -1,9 +1,11 @@
+import hashlib
+
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.urls import reverse
 
 import blogicum.constants as constants
-from .managers import PostManager
+from .managers import PostManager, PostQuerySet
 
 User = get_user_model()
 
@@ -29,6 +31,23 @@ class DateBaseModel(models.Model):
         abstract = True
 
 
+class ModificationDateTimeField(models.DateTimeField):
+    """Дата изменения, обновляется при каждом сохранении объекта."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('auto_now', True)
+        super().__init__(*args, **kwargs)
+
+
+class UpdateDateBaseModel(models.Model):
+    updated_at = ModificationDateTimeField(
+        verbose_name='Изменено',
+    )
+
+    class Meta:
+        abstract = True
+
+
 class Category(AvailabilityBaseModel, DateBaseModel):
     """Модель категории публикации."""
 
@@ -45,6 +64,11 @@ class Category(AvailabilityBaseModel, DateBaseModel):
         help_text='Идентификатор страницы для URL; '
         'разрешены символы латиницы, цифры, дефис и подчёркивание.',
     )
+    published_posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Опубликованных записей',
+    )
 
     class Meta:
         verbose_name = 'категория'
@@ -70,7 +94,7 @@ class Location(AvailabilityBaseModel, DateBaseModel):
         return self.name[:constants.REPRESENTATION_LENGTH]
 
 
-class Post(AvailabilityBaseModel, DateBaseModel):
+class Post(AvailabilityBaseModel, DateBaseModel, UpdateDateBaseModel):
     """Модель публикации."""
 
     title = models.CharField(
@@ -85,16 +109,29 @@ class Post(AvailabilityBaseModel, DateBaseModel):
         help_text='Если установить дату и время в будущем '
         '— можно делать отложенные публикации.',
     )
+    is_live = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Дата публикации наступила',
+    )
     image = models.ImageField(
         verbose_name='Фото',
         upload_to='post_images',
         blank=True
     )
+    image_variants_source = models.CharField(
+        max_length=constants.MAX_FIELD_LENGTH,
+        blank=True,
+        editable=False,
+        verbose_name='Фото, для которого готовы уменьшенные копии',
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
         related_name='author',
         verbose_name='Автор публикации',
+        # Поиск по автору обслуживает post_author_feed_idx.
+        db_index=False,
     )
     location = models.ForeignKey(
         Location,
@@ -110,23 +147,93 @@ class Post(AvailabilityBaseModel, DateBaseModel):
         null=True,
         related_name='category',
         verbose_name='Категория',
+        # Поиск по категории обслуживает post_category_pub_date_idx.
+        db_index=False,
     )
-    objects = models.Manager()
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
+    objects = PostQuerySet.as_manager()
     published_posts = PostManager()
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                condition=models.Q(is_published=True, is_live=True),
+                name='post_live_feed_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                condition=models.Q(is_published=True, is_live=True),
+                name='post_live_category_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_feed_idx',
+            ),
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_live=False),
+                name='post_scheduled_idx',
+            ),
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_pub_date_idx',
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                name='post_category_pub_date_idx',
+            ),
+        )
+
+    def save(self, *args, update_fields=None, **kwargs):
+        if update_fields:
+            update_fields = {*update_fields, 'is_live'}
+        super().save(*args, update_fields=update_fields, **kwargs)
 
     def get_absolute_url(self):
         return reverse('blog:profile', kwargs={'username': self.author})
 
+    @property
+    def has_image_variants(self) -> bool:
+        return bool(self.image) and (
+            self.image_variants_source == self.image.name
+        )
+
+    @property
+    def card_version(self) -> str:
+        """Версия карточки публикации для кэша фрагментов."""
+        category = self.category
+        location = self.location
+        state = (
+            self.title,
+            self.text,
+            self.pub_date,
+            self.image.name,
+            self.image_variants_source,
+            self.is_published,
+            self.comment_count,
+            self.author.username,
+            category and (
+                category.slug,
+                category.title,
+                category.is_published,
+            ),
+            location and (location.name, location.is_published),
+        )
+        return hashlib.md5(repr(state).encode()).hexdigest()
+
     def __str__(self) -> str:
         return self.title[:constants.REPRESENTATION_LENGTH]
 
 
-class Comment(DateBaseModel):
+class Comment(DateBaseModel, UpdateDateBaseModel):
     """Модель комментария публикации."""
 
     text = models.TextField('Текст комментария')
@@ -147,6 +254,16 @@ class Comment(DateBaseModel):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+            models.Index(
+                fields=('-created_at', '-id'),
+                name='comment_created_idx',
+            ),
+        )
 
     def __str__(self) -> str:
         return self.text[:30]
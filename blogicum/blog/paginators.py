@@ -0,0 +1,215 @@
+import base64
+import binascii
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.utils.functional import cached_property
+
+from blogicum.constants import (ESTIMATED_COUNT_THRESHOLD,
+                                PAGINATOR_COUNT_TIMEOUT, PAGINATOR_WINDOW)
+from blogicum.metrics import inc
+from .cache import get_versions
+
+
+class WindowedPage(Page):
+    """Страница с сокращённым списком номеров страниц."""
+
+    @property
+    def page_range(self):
+        return self.paginator.get_elided_page_range(
+            self.number,
+            on_each_side=PAGINATOR_WINDOW,
+            on_ends=1,
+        )
+
+
+class WindowedPaginator(Paginator):
+    """Пагинатор, выводящий первую, последнюю и соседние страницы."""
+
+    def _get_page(self, *args, **kwargs) -> WindowedPage:
+        return WindowedPage(*args, **kwargs)
+
+
+class CachedCountPaginator(WindowedPaginator):
+    """Пагинатор, кэширующий число объектов до изменения групп страниц."""
+
+    count_timeout = PAGINATOR_COUNT_TIMEOUT
+
+    def __init__(
+            self,
+            object_list,
+            per_page,
+            cache_groups: Iterable[str] = (),
+            **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_groups = tuple(cache_groups)
+
+    def get_count_key(self) -> str:
+        query = getattr(self.object_list, 'query', None)
+        digest = hashlib.md5(str(query).encode()).hexdigest()
+        versions = ':'.join(get_versions(self.cache_groups))
+        return f'blog:count:{digest}:{versions}'
+
+    @cached_property
+    def count(self) -> int:
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and query.is_empty():
+            return 0
+        key = self.get_count_key()
+        count = cache.get(key)
+        inc(
+            'blog_cache_requests_total',
+            cache='count',
+            result='miss' if count is None else 'hit',
+        )
+        if count is None:
+            count = super().count
+            cache.set(key, count, self.count_timeout)
+        return count
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """Оценка числа строк таблицы без COUNT(*).
+
+    PostgreSQL берёт её из статистики планировщика, SQLite — по
+    наибольшему rowid, что завышает число строк после удалений.
+    """
+    connection = connections[queryset.db]
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class '
+                'WHERE oid = %s::regclass',
+                [table],
+            )
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f'SELECT MAX(rowid) FROM {table}')
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None or row[0] is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(CachedCountPaginator):
+    """Пагинатор, оценивающий размер большой таблицы без фильтров.
+
+    Для отфильтрованных выборок и небольших таблиц считает точно
+    и кэширует результат.
+    """
+
+    estimate_threshold = ESTIMATED_COUNT_THRESHOLD
+
+    @cached_property
+    def count(self) -> int:
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where and not query.distinct:
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+        return super().count
+
+
+class KnownCountPaginator(WindowedPaginator):
+    """Пагинатор с заранее известным числом объектов."""
+
+    def __init__(self, object_list, per_page, count: int, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._count = count
+
+    @cached_property
+    def count(self) -> int:
+        return self._count
+
+
+class CursorPage:
+    """Страница курсорной пагинации."""
+
+    def __init__(
+            self,
+            object_list: list,
+            next_cursor: str = None,
+            previous_cursor: str = None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Пагинация по ключу (pub_date, id) без COUNT и OFFSET."""
+
+    def __init__(self, object_list: QuerySet, per_page: int):
+        self.object_list = object_list.order_by('-pub_date', '-pk')
+        self.per_page = int(per_page)
+
+    @staticmethod
+    def encode_cursor(post) -> str:
+        if isinstance(post, dict):
+            pub_date, pk = post['pub_date'], post['pk']
+        else:
+            pub_date, pk = post.pub_date, post.pk
+        raw = f'{pub_date.isoformat()}|{pk}'
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, int]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            pub_date, pk = raw.rsplit('|', 1)
+            return datetime.fromisoformat(pub_date), int(pk)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise InvalidPage('Некорректный курсор страницы')
+
+    def page(self, after: str = None, before: str = None) -> CursorPage:
+        if before:
+            pub_date, pk = self.decode_cursor(before)
+            rows = list(self.object_list.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk),
+            ).reverse()[:self.per_page + 1])
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next = True
+        else:
+            queryset = self.object_list
+            if after:
+                pub_date, pk = self.decode_cursor(after)
+                queryset = queryset.filter(
+                    Q(pub_date__lt=pub_date)
+                    | Q(pub_date=pub_date, pk__lt=pk),
+                )
+            rows = list(queryset[:self.per_page + 1])
+            has_next = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_previous = bool(after)
+        if not rows:
+            return CursorPage(rows)
+        return CursorPage(
+            rows,
+            next_cursor=self.encode_cursor(rows[-1]) if has_next else None,
+            previous_cursor=(
+                self.encode_cursor(rows[0]) if has_previous else None
+            ),
+        )
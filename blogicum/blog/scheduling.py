@@ -0,0 +1,55 @@
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .cache import (FEED_GROUP, category_group, invalidate, post_group,
+                    profile_group)
+from .counters import shift_published_counts
+from .models import Post
+
+PUBLISH_BATCH_SIZE = 500
+
+
+def publish_due_posts(now: Optional[datetime] = None) -> int:
+    """Переводит в эфир публикации, дата которых наступила."""
+    now = now or timezone.now()
+    published = 0
+    while True:
+        with transaction.atomic():
+            due = list(Post.objects.filter(
+                is_live=False,
+                pub_date__lte=now,
+            ).values_list(
+                'pk',
+                'category_id',
+                'category__slug',
+                'author__username',
+                'is_published',
+            )[:PUBLISH_BATCH_SIZE])
+            if not due:
+                return published
+            Post.objects.filter(
+                pk__in=[row[0] for row in due],
+            ).update(is_live=True, updated_at=timezone.now())
+            shift_published_counts(Counter(
+                category_id
+                for _, category_id, _, _, is_published in due
+                if is_published
+            ))
+        groups = [FEED_GROUP]
+        for pk, _, slug, username, _ in due:
+            groups += [post_group(pk), profile_group(username)]
+            if slug:
+                groups.append(category_group(slug))
+        invalidate(*groups)
+        published += len(due)
+
+
+def next_publication_date() -> Optional[datetime]:
+    return Post.objects.filter(is_live=False).aggregate(
+        next_date=Min('pub_date'),
+    )['next_date']
@@ -0,0 +1,268 @@
+import math
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.core.paginator import InvalidPage
+from django.db import connection
+from django.db.models import Q
+from django.db.models.query import QuerySet
+
+from blogicum.constants import (MAX_SEARCH_RESULTS, MAX_SEARCH_TERMS,
+                                SEARCH_CHUNK_SIZE)
+from .paginators import CursorPage, CursorPaginator
+
+SEARCH_TABLE = 'blog_post_search'
+# Слово со звёздочкой на конце ищется как начало слова.
+WORD_RE = re.compile(r'\w+\*?')
+
+# Строки индекса FTS5 упорядочены по ключу из секунды pub_date и id
+# публикации: индекс сам отдаёт совпадения от новых к старым.
+SEARCH_KEY_SHIFT = 2 ** 31
+SEARCH_KEY_SQL = (
+    "CAST(strftime('%%s', pub_date) AS INTEGER) * 2147483648 + id"
+)
+
+
+def search_terms(query: str) -> list[str]:
+    """Слова поискового запроса."""
+    return WORD_RE.findall(query)[:MAX_SEARCH_TERMS]
+
+
+def search_key(post_id: int, pub_date: datetime) -> int:
+    """Ключ строки поискового индекса."""
+    return math.floor(pub_date.timestamp()) * SEARCH_KEY_SHIFT + post_id
+
+
+class BasicSearchBackend:
+    """Поиск подстроки в заголовке и тексте без индекса."""
+
+    def search(self, queryset: QuerySet, terms: list[str]) -> QuerySet:
+        for term in terms:
+            term = term.rstrip('*')
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(text__icontains=term),
+            )
+        return queryset
+
+    def paginator(
+            self,
+            queryset: QuerySet,
+            terms: list[str],
+            per_page: int,
+            until: Optional[datetime] = None):
+        """Курсорная пагинация совпадений не позже даты ``until``."""
+        if until is not None:
+            queryset = queryset.filter(pub_date__lte=until)
+        return CursorPaginator(self.search(queryset, terms), per_page)
+
+    def index(self, post, saved_pub_date: datetime = None) -> None:
+        pass
+
+    def index_many(self, posts: list) -> None:
+        pass
+
+    def remove(self, post_id: int, pub_date: datetime) -> None:
+        pass
+
+    def rebuild(self) -> int:
+        return 0
+
+
+class SQLiteSearchBackend(BasicSearchBackend):
+    """Полнотекстовый поиск по индексу FTS5.
+
+    Совпадения читаются из индекса от новых к старым порциями,
+    начиная с нужного числа строк, и сразу проверяются фильтрами
+    ``queryset``: скрытые записи не вытесняют видимые, а частое слово
+    не заставляет выбирать из индекса все совпадения. Слова ищутся
+    целиком: список документов для начала слова FTS5 собирает заранее
+    из всех его продолжений, поэтому поиск по началу слова включается
+    звёздочкой и на частых словах заметно медленнее.
+    """
+
+    def matches(
+            self,
+            queryset: QuerySet,
+            terms: list[str],
+            limit: int,
+            older_than: Optional[int] = None,
+            newer_than: Optional[int] = None,
+            ascending: bool = False) -> list[tuple[int, int]]:
+        """Ключи и pk первых ``limit`` видимых совпадений между ключами.
+
+        Совпадения идут от новых к старым, с ``ascending`` — наоборот.
+        """
+        match = ' '.join(
+            f'"{term[:-1]}"*' if term.endswith('*') else f'"{term}"'
+            for term in terms
+        )
+        # Каждый запрос по началу слова заново собирает его список
+        # документов, поэтому такие совпадения читаются полной порцией.
+        size = SEARCH_CHUNK_SIZE
+        if not any(term.endswith('*') for term in terms):
+            size = min(2 * limit, size)
+        found = []
+        while len(found) < limit:
+            sql = (
+                f'SELECT rowid FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s'
+            )
+            params = [match]
+            if older_than is not None:
+                sql += ' AND rowid < %s'
+                params.append(older_than)
+            if newer_than is not None:
+                sql += ' AND rowid > %s'
+                params.append(newer_than)
+            order = 'ASC' if ascending else 'DESC'
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'{sql} ORDER BY rowid {order} LIMIT %s',
+                    [*params, size],
+                )
+                keys = [row[0] for row in cursor.fetchall()]
+            if not keys:
+                break
+            if ascending:
+                newer_than = keys[-1]
+            else:
+                older_than = keys[-1]
+            candidates = {key: key % SEARCH_KEY_SHIFT for key in keys}
+            visible = set(queryset.filter(
+                pk__in=candidates.values(),
+            ).values_list('pk', flat=True))
+            found += [
+                (key, pk) for key, pk in candidates.items() if pk in visible
+            ]
+            if len(keys) < size:
+                break
+            size = min(2 * size, SEARCH_CHUNK_SIZE)
+        return found[:limit]
+
+    def search(self, queryset: QuerySet, terms: list[str]) -> QuerySet:
+        found = self.matches(queryset, terms, MAX_SEARCH_RESULTS)
+        if not found:
+            return queryset.none()
+        return queryset.filter(pk__in=[pk for _, pk in found])
+
+    def paginator(
+            self,
+            queryset: QuerySet,
+            terms: list[str],
+            per_page: int,
+            until: Optional[datetime] = None):
+        return SearchPaginator(self, queryset, terms, per_page, until)
+
+    def index(self, post, saved_pub_date: datetime = None) -> None:
+        if saved_pub_date is not None:
+            self.remove(post.pk, saved_pub_date)
+        self.index_many([post])
+
+    def index_many(self, posts: list) -> None:
+        keys = [search_key(post.pk, post.pub_date) for post in posts]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+                [[key] for key in keys],
+            )
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) '
+                'VALUES (%s, %s, %s)',
+                [
+                    [key, post.title, post.text]
+                    for key, post in zip(keys, posts)
+                ],
+            )
+
+    def remove(self, post_id: int, pub_date: datetime) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+                [search_key(post_id, pub_date)],
+            )
+
+    def rebuild(self) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) '
+                f'SELECT {SEARCH_KEY_SQL}, title, text FROM blog_post',
+                [],
+            )
+            indexed = cursor.rowcount
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) "
+                "VALUES ('optimize')",
+            )
+        return indexed
+
+
+class SearchPaginator:
+    """Курсорная пагинация результатов поиска по ключу индекса."""
+
+    def __init__(
+            self,
+            backend: SQLiteSearchBackend,
+            queryset: QuerySet,
+            terms: list[str],
+            per_page: int,
+            until: Optional[datetime] = None):
+        self.backend = backend
+        self.object_list = queryset
+        self.terms = terms
+        self.per_page = int(per_page)
+        # Отложенные публикации стоят в индексе первыми, но скрыты:
+        # чтение начинается сразу после них.
+        self.newest = None
+        if until is not None:
+            self.newest = search_key(0, until + timedelta(seconds=1))
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> int:
+        try:
+            return int(cursor)
+        except ValueError:
+            raise InvalidPage('Некорректный курсор страницы')
+
+    def page(self, after: str = None, before: str = None) -> CursorPage:
+        if before:
+            rows = self.backend.matches(
+                self.object_list,
+                self.terms,
+                self.per_page + 1,
+                older_than=self.newest,
+                newer_than=self.decode_cursor(before),
+                ascending=True,
+            )
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next = True
+        else:
+            rows = self.backend.matches(
+                self.object_list,
+                self.terms,
+                self.per_page + 1,
+                older_than=self.decode_cursor(after) if after else self.newest,
+            )
+            has_next = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_previous = bool(after)
+        if not rows:
+            return CursorPage(rows)
+        posts = self.object_list.in_bulk([pk for _, pk in rows])
+        return CursorPage(
+            [posts[pk] for _, pk in rows if pk in posts],
+            next_cursor=str(rows[-1][0]) if has_next else None,
+            previous_cursor=str(rows[0][0]) if has_previous else None,
+        )
+
+
+SEARCH_BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_search_backend() -> BasicSearchBackend:
+    """Поисковый движок для текущей базы данных."""
+    return SEARCH_BACKENDS.get(connection.vendor, BasicSearchBackend)()
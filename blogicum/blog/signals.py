@@ -0,0 +1,190 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import (FEED_GROUP, category_group, invalidate_on_commit,
+                    post_group, profile_group)
+from .counters import shift_published_counts
+from .models import Category, Comment, Location, Post
+from .search import get_search_backend
+
+User = get_user_model()
+
+
+def posts_groups(posts: QuerySet) -> list[str]:
+    """Группы страниц, на которых выводятся публикации."""
+    groups = [FEED_GROUP]
+    for post_id, slug, username in posts.values_list(
+        'pk',
+        'category__slug',
+        'author__username',
+    ):
+        groups += [post_group(post_id), profile_group(username)]
+        if slug:
+            groups.append(category_group(slug))
+    return groups
+
+
+def post_groups(post_id: int) -> list[str]:
+    """Группы страниц, на которых выводится публикация."""
+    return [
+        post_group(post_id),
+        *posts_groups(Post.objects.filter(pk=post_id)),
+    ]
+
+
+@receiver(pre_save, sender=Post)
+def set_post_live(sender, instance, **kwargs):
+    instance.is_live = instance.pub_date <= timezone.now()
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_delete, sender=Post)
+def remember_post_state(sender, instance, **kwargs):
+    instance._cache_groups = []
+    instance._counted_category = None
+    instance._saved_pub_date = None
+    if not instance.pk:
+        return
+    state = Post.objects.filter(pk=instance.pk).values(
+        'category_id',
+        'category__slug',
+        'author__username',
+        'is_published',
+        'is_live',
+        'pub_date',
+    ).first()
+    if state is None:
+        return
+    instance._saved_pub_date = state['pub_date']
+    instance._cache_groups = [profile_group(state['author__username'])]
+    if state['category__slug']:
+        instance._cache_groups.append(category_group(state['category__slug']))
+    if state['is_published'] and state['is_live']:
+        instance._counted_category = state['category_id']
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    groups = getattr(instance, '_cache_groups', [])
+    if instance.category_id:
+        groups.append(category_group(instance.category.slug))
+    invalidate_on_commit(
+        FEED_GROUP,
+        post_group(instance.pk),
+        profile_group(instance.author.username),
+        *groups,
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def update_category_counts(sender, instance, signal, **kwargs):
+    deltas = Counter()
+    deltas[instance._counted_category] -= 1
+    if signal is post_save and instance.is_published and instance.is_live:
+        deltas[instance.category_id] += 1
+    shift_published_counts(deltas)
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    get_search_backend().index(
+        instance,
+        getattr(instance, '_saved_pub_date', None),
+    )
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_index(sender, instance, **kwargs):
+    get_search_backend().remove(
+        instance.pk,
+        getattr(instance, '_saved_pub_date', None) or instance.pub_date,
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    invalidate_on_commit(*post_groups(instance.post_id))
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def remember_category_groups(sender, instance, **kwargs):
+    if not instance.pk:
+        instance._cache_groups = []
+        return
+    groups = [
+        category_group(slug)
+        for slug in Category.objects.filter(
+            pk=instance.pk,
+        ).values_list('slug', flat=True)
+    ]
+    for post_id, username in Post.objects.filter(
+        category=instance,
+    ).values_list('pk', 'author__username'):
+        groups += [post_group(post_id), profile_group(username)]
+    instance._cache_groups = groups
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_pages(sender, instance, **kwargs):
+    invalidate_on_commit(
+        FEED_GROUP,
+        category_group(instance.slug),
+        *getattr(instance, '_cache_groups', []),
+    )
+
+
+@receiver(pre_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def remember_location_groups(sender, instance, **kwargs):
+    instance._cache_groups = []
+    if instance.pk:
+        instance._cache_groups = posts_groups(
+            Post.objects.filter(location=instance),
+        )
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_pages(sender, instance, **kwargs):
+    invalidate_on_commit(
+        FEED_GROUP,
+        *getattr(instance, '_cache_groups', []),
+    )
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, update_fields, **kwargs):
+    instance._saved_username = None
+    if instance.pk and (not update_fields or 'username' in update_fields):
+        instance._saved_username = User.objects.filter(
+            pk=instance.pk,
+        ).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile_pages(sender, instance, update_fields, **kwargs):
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    groups = [profile_group(instance.username)]
+    saved_username = getattr(instance, '_saved_username', None)
+    if saved_username not in (None, instance.username):
+        # Имя автора выводится в карточках его публикаций и в комментариях.
+        groups += [
+            profile_group(saved_username),
+            *posts_groups(Post.objects.filter(
+                Q(author=instance) | Q(comments__author=instance),
+            ).distinct()),
+        ]
+    invalidate_on_commit(*groups)
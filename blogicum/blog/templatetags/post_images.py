@@ -0,0 +1,17 @@
+from django import template
+from django.core.files.storage import default_storage
+
+from blog.thumbnails import variant_name
+
+register = template.Library()
+
+
+@register.filter
+def image_variant(post, spec: str) -> str:
+    """URL копии фото вида ``thumb.webp`` или оригинала, пока её нет."""
+    if not post.has_image_variants:
+        return post.image.url
+    variant, extension = spec.split('.')
+    return default_storage.url(
+        variant_name(post.image.name, variant, extension),
+    )
@@ -0,0 +1,123 @@
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from PIL import Image, ImageOps
+
+from blogicum.constants import THUMBNAIL_WORKERS
+from .cache import invalidate
+from .models import Post
+from .signals import post_groups
+
+IMAGE_VARIANTS = {
+    'thumb': (640, 640),
+    'medium': (1280, 1280),
+}
+IMAGE_FORMATS = {
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+}
+
+logger = logging.getLogger(__name__)
+executor = ThreadPoolExecutor(
+    max_workers=THUMBNAIL_WORKERS,
+    thread_name_prefix='thumbnails',
+)
+
+
+def variant_name(name: str, variant: str, extension: str) -> str:
+    directory, filename = posixpath.split(posixpath.splitext(name)[0])
+    return posixpath.join(
+        directory,
+        'variants',
+        f'{filename}_{variant}.{extension}',
+    )
+
+
+def variant_names(name: str) -> list[str]:
+    """Имена всех уменьшенных копий фото ``name``."""
+    return [
+        variant_name(name, variant, extension)
+        for variant in IMAGE_VARIANTS
+        for extension in IMAGE_FORMATS
+    ]
+
+
+def delete_image_variants(name: str) -> None:
+    """Удаляет уменьшенные копии фото ``name``."""
+    if not name:
+        return
+    for variant in variant_names(name):
+        default_storage.delete(variant)
+
+
+def generate_image_variants(post_id: int) -> None:
+    """Создаёт уменьшенные копии фото публикации.
+
+    Копии прежнего фото удаляются, когда публикация переключается на
+    новые или остаётся без фото. Если фото успели заменить или
+    публикацию удалить, пока копии готовились, удаляются только что
+    созданные копии.
+    """
+    post = Post.objects.filter(pk=post_id).only(
+        'image', 'image_variants_source',
+    ).first()
+    if post is None:
+        return
+    if not post.image:
+        if Post.objects.filter(pk=post_id, image='').update(
+            image_variants_source='',
+        ):
+            delete_image_variants(post.image_variants_source)
+        return
+    with post.image.open('rb') as source:
+        image = ImageOps.exif_transpose(Image.open(source))
+        image.load()
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    for variant, size in IMAGE_VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail(size, Image.Resampling.LANCZOS)
+        for extension, (image_format, params) in IMAGE_FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, image_format, **params)
+            name = variant_name(post.image.name, variant, extension)
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            default_storage.save(name, ContentFile(buffer.getvalue()))
+    if not Post.objects.filter(pk=post_id, image=post.image.name).update(
+        image_variants_source=post.image.name,
+    ):
+        delete_image_variants(post.image.name)
+        return
+    invalidate(*post_groups(post_id))
+    if post.image_variants_source != post.image.name:
+        delete_image_variants(post.image_variants_source)
+
+
+def _generate_in_worker(post_id: int) -> None:
+    try:
+        generate_image_variants(post_id)
+    except Exception:
+        logger.exception('Не удалось подготовить фото публикации %s', post_id)
+    finally:
+        connection.close()
+
+
+@receiver(post_delete, sender=Post)
+def delete_post_image_variants(sender, instance, **kwargs):
+    name = instance.image_variants_source
+    transaction.on_commit(lambda: delete_image_variants(name))
+
+
+def schedule_image_variants(post_id: int) -> None:
+    """Ставит подготовку копий в очередь после фиксации транзакции."""
+    transaction.on_commit(
+        lambda: executor.submit(_generate_in_worker, post_id),
+    )
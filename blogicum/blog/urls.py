@@ -1,10 +1,12 @@
 from django.urls import path
 
-from . import views
+from . import feeds, views
 
 app_name = 'blog'
 urlpatterns = [
     path('', views.PostListView.as_view(), name='index'),
+    path('feed/rss/', feeds.PostsFeed(), name='feed_rss'),
+    path('feed/atom/', feeds.AtomPostsFeed(), name='feed_atom'),
     path(
         'posts/create/',
         views.PostCreateView.as_view(),
@@ -50,9 +52,39 @@ urlpatterns = [
         views.PostInProfileListView.as_view(),
         name='profile',
     ),
+    path(
+        'search/',
+        views.PostSearchView.as_view(),
+        name='search',
+    ),
+    path(
+        'profile/<slug:username>/rss/',
+        feeds.AuthorPostsFeed(),
+        name='profile_feed_rss',
+    ),
+    path(
+        'profile/<slug:username>/atom/',
+        feeds.AtomAuthorPostsFeed(),
+        name='profile_feed_atom',
+    ),
+    path(
+        'category/',
+        views.CategoryListView.as_view(),
+        name='category_list',
+    ),
     path(
         'category/<slug:category_slug>/',
         views.PostInCategoryListView.as_view(),
         name='category_posts',
     ),
+    path(
+        'category/<slug:category_slug>/rss/',
+        feeds.CategoryPostsFeed(),
+        name='category_feed_rss',
+    ),
+    path(
+        'category/<slug:category_slug>/atom/',
+        feeds.AtomCategoryPostsFeed(),
+        name='category_feed_atom',
+    ),
 ]
@@ -1,20 +1,35 @@
+import hashlib
 from typing import Any
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db import models
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db import transaction
+from django.db.models import F
 from django.db.models.base import Model
 from django.db.models.query import QuerySet
 from django.forms import BaseModelForm
-from django.http import Http404, HttpResponse, HttpRequest
+from django.http import Http404, HttpResponse, HttpRequest, QueryDict
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
                                   UpdateView, View)
 
-from blogicum.constants import POSTS_BY_PAGE
+from blogicum.constants import (COMMENTS_BY_PAGE, CURSOR_PAGINATION,
+                                PAGE_CACHE_TIMEOUT, POSTS_BY_PAGE)
+from blogicum.metrics import inc, observe
+from .cache import (FEED_GROUP, category_group, get_versions, page_key,
+                    post_group, profile_group)
 from .models import Category, Comment, Post
 from .forms import CommentForm, CustomUserForm, PostForm
+from .paginators import (CachedCountPaginator, CursorPaginator,
+                         KnownCountPaginator)
+from .search import get_search_backend, search_terms
+from .thumbnails import schedule_image_variants
 
 User = get_user_model()
 
@@ -53,7 +68,147 @@ class CommentMixin(View):
         return reverse('blog:post_detail', args=[self.kwargs['post_id']])
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class AnonymousCacheMixin:
+    """Кэширование страниц для анонимных читателей."""
+
+    cache_groups = (FEED_GROUP,)
+
+    def get_cache_groups(self) -> tuple[str, ...]:
+        return self.cache_groups
+
+    def dispatch(
+            self,
+            request: HttpRequest,
+            *args: Any,
+            **kwargs: Any) -> HttpResponse:
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        key = page_key(request.get_full_path(), self.get_cache_groups())
+        response = cache.get(key)
+        inc(
+            'blog_cache_requests_total',
+            cache='page',
+            result='miss' if response is None else 'hit',
+        )
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.cookies:
+            response.add_post_render_callback(
+                lambda rendered: cache.set(key, rendered, PAGE_CACHE_TIMEOUT)
+            )
+        return response
+
+
+class ConditionalGetMixin:
+    """Ответ 304 на запрос неизменившейся страницы.
+
+    ETag строится по версиям групп кэша без обращения к БД.
+    Last-Modified не выдаётся: несколько сбросов за одну секунду дали бы
+    одинаковую дату, и запрос с одним If-Modified-Since получил бы 304.
+    """
+
+    def get_etag(self, request: HttpRequest) -> str:
+        parts = [
+            request.get_full_path(),
+            *get_versions(self.get_cache_groups()),
+        ]
+        if request.user.is_authenticated:
+            parts += [
+                str(request.user.pk),
+                request.user.get_username(),
+                request.META.get('CSRF_COOKIE', ''),
+            ]
+        digest = hashlib.md5('|'.join(parts).encode()).hexdigest()
+        return quote_etag(digest)
+
+    def dispatch(
+            self,
+            request: HttpRequest,
+            *args: Any,
+            **kwargs: Any) -> HttpResponse:
+        if request.method != 'GET':
+            return super().dispatch(request, *args, **kwargs)
+        etag = self.get_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return self.set_etag(response, etag)
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        if getattr(response, 'is_rendered', True):
+            return self.set_etag(response, etag)
+        # Шаблон может выдать CSRF-cookie, она входит в ETag.
+        response.add_post_render_callback(
+            lambda rendered: self.set_etag(rendered, self.get_etag(request))
+        )
+        return response
+
+    def set_etag(self, response: HttpResponse, etag: str) -> HttpResponse:
+        response['ETag'] = etag
+        patch_cache_control(
+            response,
+            no_cache=True,
+            private=self.request.user.is_authenticated,
+        )
+        return response
+
+
+class CachedCountMixin:
+    """Кэширование числа публикаций до изменения групп страниц."""
+
+    def get_paginator(self, queryset, per_page, **kwargs) -> Paginator:
+        return CachedCountPaginator(
+            queryset,
+            per_page,
+            cache_groups=self.get_cache_groups(),
+            **kwargs,
+        )
+
+
+class CursorPaginationMixin:
+    """Курсорная пагинация ленты публикаций."""
+
+    cursor_pagination = CURSOR_PAGINATION
+
+    def get_cursor_paginator(self, queryset, page_size) -> CursorPaginator:
+        return CursorPaginator(queryset, page_size)
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.cursor_pagination:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = self.get_cursor_paginator(queryset, page_size)
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context['cursor_pagination'] = self.cursor_pagination
+        return context
+
+
+class PostImageMixin:
+    """Фоновая подготовка уменьшенных копий фото публикации."""
+
+    def form_valid(self, form: BaseModelForm) -> HttpResponse:
+        response = super().form_valid(form)
+        if 'image' in form.changed_data:
+            if self.object.image:
+                observe(
+                    'blog_image_upload_bytes',
+                    form.cleaned_data['image'].size,
+                )
+            schedule_image_variants(self.object.pk)
+        return response
+
+
+class PostCreateView(LoginRequiredMixin, PostImageMixin, CreateView):
     """Создание публикации."""
 
     model = Post
@@ -62,10 +217,17 @@ class PostCreateView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form: BaseModelForm) -> HttpResponse:
         form.instance.author = self.request.user
-        return super().form_valid(form)
+        response = super().form_valid(form)
+        inc('blog_posts_created_total')
+        return response
 
 
-class PostListView(ListView):
+class PostListView(
+        ConditionalGetMixin,
+        AnonymousCacheMixin,
+        CachedCountMixin,
+        CursorPaginationMixin,
+        ListView):
     """Вывод публикаций."""
 
     model = Post
@@ -74,39 +236,39 @@ class PostListView(ListView):
     queryset = Post.published_posts.all()
 
 
-class PostInProfileListView(ListView):
+class PostInProfileListView(
+        ConditionalGetMixin,
+        AnonymousCacheMixin,
+        CachedCountMixin,
+        CursorPaginationMixin,
+        ListView):
     """Вывод публикаций пользователя."""
 
+    profile_object = None
     model = Post
     template_name = 'blog/profile.html'
     paginate_by = POSTS_BY_PAGE
 
+    def get_cache_groups(self) -> tuple[str, ...]:
+        return (profile_group(self.kwargs['username']),)
+
     def get_queryset(self) -> QuerySet[Any]:
-        if get_object_or_404(
+        self.profile_object = get_object_or_404(
             User,
             username=self.kwargs['username'],
-        ) == self.request.user:
-            return Post.objects.filter(
-                author__username=self.kwargs['username'],
-            ).annotate(
-                comment_count=models.Count('comments'),
-            ).order_by(
-                '-pub_date',
-            ).select_related(
-                'author',
-                'category',
-                'location',
-            )
-        return Post.published_posts.filter(
-            author__username=self.kwargs['username'],
         )
+        queryset = Post.objects.with_related().filter(
+            author=self.profile_object,
+        ).order_by(
+            '-pub_date',
+        )
+        if self.profile_object != self.request.user:
+            return queryset.published()
+        return queryset
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        context['profile'] = get_object_or_404(
-            User,
-            username=self.kwargs['username'],
-        )
+        context['profile'] = self.profile_object
         return context
 
 
@@ -122,31 +284,33 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         return self.request.user
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalGetMixin, AnonymousCacheMixin, DetailView):
     """Вывод публикации."""
 
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
-    queryset = Post.objects.select_related('author', 'category', 'location')
 
-    def dispatch(
-            self,
-            request: HttpRequest,
-            *args: Any,
-            **kwargs: Any) -> HttpResponse:
-        if request.user != self.get_object().author:
-            self.queryset = Post.published_posts.all()
-        return super().dispatch(request, *args, **kwargs)
+    def get_cache_groups(self) -> tuple[str, ...]:
+        return (post_group(self.kwargs['post_id']),)
+
+    def get_queryset(self) -> QuerySet[Any]:
+        return Post.objects.with_related().visible_to(self.request.user)
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.get_object().comments.all()
+        paginator = Paginator(
+            self.object.comments.select_related('author'),
+            COMMENTS_BY_PAGE,
+        )
+        context['comments'] = paginator.get_page(
+            self.request.GET.get('comments_page'),
+        )
         return context
 
 
-class PostUpdateView(LoginRequiredMixin, UpdateView):
+class PostUpdateView(LoginRequiredMixin, PostImageMixin, UpdateView):
     """Редактирование публикации."""
 
     model = Post
@@ -181,7 +345,11 @@ class PostDeleteView(OnlyAuthorMixin, DeleteView):
         return context
 
 
-class PostInCategoryListView(ListView):
+class PostInCategoryListView(
+        ConditionalGetMixin,
+        AnonymousCacheMixin,
+        CursorPaginationMixin,
+        ListView):
     """Вывод публикаций в категории."""
 
     category_object = None
@@ -189,29 +357,79 @@ class PostInCategoryListView(ListView):
     template_name = 'blog/category.html'
     paginate_by = POSTS_BY_PAGE
 
-    def dispatch(
-            self,
-            request: HttpRequest,
-            *args: Any,
-            **kwargs: Any) -> HttpResponse:
-        self.category_object = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'])
-        if not self.category_object.is_published:
-            raise Http404
-        return super().dispatch(request, *args, **kwargs)
+    def get_cache_groups(self) -> tuple[str, ...]:
+        return (category_group(self.kwargs['category_slug']),)
 
     def get_queryset(self) -> QuerySet[Any]:
+        self.category_object = get_object_or_404(
+            Category,
+            slug=self.kwargs['category_slug'],
+            is_published=True,
+        )
         return Post.published_posts.filter(
             category=self.category_object,
         )
 
+    def get_paginator(self, queryset, per_page, **kwargs) -> Paginator:
+        return KnownCountPaginator(
+            queryset,
+            per_page,
+            count=self.category_object.published_posts_count,
+            **kwargs,
+        )
+
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         context['category'] = self.category_object
         return context
 
 
+class PostSearchView(AnonymousCacheMixin, CursorPaginationMixin, ListView):
+    """Поиск публикаций."""
+
+    model = Post
+    template_name = 'blog/search.html'
+    paginate_by = POSTS_BY_PAGE
+    cursor_pagination = True
+
+    def get_queryset(self) -> QuerySet[Any]:
+        self.terms = search_terms(self.request.GET.get('q', ''))
+        if not self.terms:
+            return Post.published_posts.none()
+        return Post.published_posts.all()
+
+    def get_cursor_paginator(self, queryset, page_size):
+        if not self.terms:
+            return super().get_cursor_paginator(queryset, page_size)
+        return get_search_backend().paginator(
+            queryset,
+            self.terms,
+            page_size,
+            until=timezone.now(),
+        )
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get('q', '').strip()
+        page_query = QueryDict(mutable=True)
+        page_query['q'] = query
+        context['query'] = query
+        context['page_query'] = page_query.urlencode() + '&'
+        return context
+
+
+class CategoryListView(AnonymousCacheMixin, ListView):
+    """Вывод опубликованных категорий."""
+
+    model = Category
+    template_name = 'blog/categories.html'
+    queryset = Category.objects.filter(
+        is_published=True,
+    ).order_by(
+        'title',
+    )
+
+
 class CommentCreateView(LoginRequiredMixin, CreateView):
     """Создание комментария."""
 
@@ -226,7 +444,13 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form) -> HttpResponse:
         form.instance.author = self.request.user
         form.instance.post = self.post_object
-        return super().form_valid(form)
+        with transaction.atomic():
+            response = super().form_valid(form)
+            Post.objects.filter(pk=self.post_object.pk).update(
+                comment_count=F('comment_count') + 1,
+            )
+        inc('blog_comments_total', action='create')
+        return response
 
     def get_success_url(self):
         return reverse('blog:post_detail', args=[self.kwargs['post_id']])
@@ -237,8 +461,23 @@ class CommentUpdateView(CommentMixin, UpdateView):
 
     form_class = CommentForm
 
+    def form_valid(self, form: BaseModelForm) -> HttpResponse:
+        response = super().form_valid(form)
+        inc('blog_comments_total', action='edit')
+        return response
+
 
 class CommentDeleteView(CommentMixin, DeleteView):
     """Удаление комментария."""
 
-    pass
+    def delete(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        with transaction.atomic():
+            response = super().delete(request, *args, **kwargs)
+            Post.objects.filter(
+                pk=self.object.post_id,
+                comment_count__gt=0,
+            ).update(
+                comment_count=F('comment_count') - 1,
+            )
+        inc('blog_comments_total', action='delete')
+        return response
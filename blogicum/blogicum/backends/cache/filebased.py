@@ -0,0 +1,22 @@
+import itertools
+
+from django.core.cache.backends import filebased
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    """Файловый кэш, общий для всех процессов на одном сервере.
+
+    Стандартный бэкенд перечисляет каталог при каждой записи, чтобы
+    проверить MAX_ENTRIES; на тысячах файлов это десятки миллисекунд.
+    Здесь проверка выполняется раз в ``CULL_EVERY`` записей процесса.
+    """
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        options = params.get('OPTIONS', {})
+        self._cull_every = int(options.get('CULL_EVERY', 100))
+        self._writes = itertools.count(1)
+
+    def _cull(self):
+        if next(self._writes) % self._cull_every == 0:
+            super()._cull()
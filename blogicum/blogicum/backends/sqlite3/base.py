@@ -0,0 +1,21 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite с настройкой PRAGMA и выбором режима транзакций.
+
+    ``PRAGMAS`` из настроек базы выполняются при каждом подключении.
+    ``TRANSACTION_MODE = 'IMMEDIATE'`` берёт блокировку записи в начале
+    транзакции: иначе конкурирующие транзакции, начавшие с чтения,
+    получают ``database is locked`` без ожидания ``busy_timeout``.
+    """
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict.get('PRAGMAS', {}).items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict.get('TRANSACTION_MODE') or 'DEFERRED'
+        self.cursor().execute(f'BEGIN {mode}')
@@ -1,3 +1,18 @@
 MAX_FIELD_LENGTH = 256
 REPRESENTATION_LENGTH = 20
 POSTS_BY_PAGE = 10
+CURSOR_PAGINATION = False
+COMMENTS_BY_PAGE = 50
+PAGE_CACHE_TIMEOUT = 60 * 5
+THUMBNAIL_WORKERS = 2
+PAGINATOR_COUNT_TIMEOUT = 60
+PAGINATOR_WINDOW = 3
+MAX_SEARCH_TERMS = 8
+MAX_SEARCH_RESULTS = 1000
+SEARCH_CHUNK_SIZE = 500
+DUMP_BATCH_SIZE = 1000
+FEED_ITEMS = 20
+API_MAX_PAGE_SIZE = 100
+TEMPLATE_PROFILE_ENTRIES = 15
+METRICS_FLUSH_INTERVAL = 5
+ESTIMATED_COUNT_THRESHOLD = 100000
@@ -0,0 +1,329 @@
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.files import locks
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from blogicum.constants import METRICS_FLUSH_INTERVAL
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+SIZE_BUCKETS = (2 ** 16, 2 ** 18, 2 ** 20, 2 ** 22, 2 ** 24)
+
+METRICS = {
+    'blog_posts_created_total': (
+        'counter', 'Созданные публикации.', None,
+    ),
+    'blog_comments_total': (
+        'counter', 'Созданные, изменённые и удалённые комментарии.', None,
+    ),
+    'blog_view_duration_seconds': (
+        'histogram', 'Время ответа по классу view.', LATENCY_BUCKETS,
+    ),
+    'blog_cache_requests_total': (
+        'counter', 'Обращения к кэшу страниц, счётчиков и лент.', None,
+    ),
+    'blog_image_upload_bytes': (
+        'histogram', 'Размер загруженных фото.', SIZE_BUCKETS,
+    ),
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Снимки завершившихся процессов складываются в один файл, чтобы каталог
+# не рос, а счётчики не убывали.
+RETIRED_NAME = 'retired'
+LOCK_NAME = 'metrics.lock'
+
+
+class Registry:
+    """Метрики процесса в памяти.
+
+    Фоновый поток раз в METRICS_FLUSH_INTERVAL секунд записывает снимок
+    в файл каталога METRICS_DIR, откуда его читают остальные процессы.
+    Файл называется по PID и времени запуска процесса, поэтому процесс
+    с повторно выданным PID не перезапишет чужие метрики. Тот же поток
+    переносит снимки завершившихся процессов в общий файл.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.pid = os.getpid()
+        self.name = f'{self.pid}-{time.time_ns()}'
+        self.values = {}
+        self.changed = False
+        self.stopped = threading.Event()
+        self.flusher = None
+
+    def _update(self, name: str, labels: dict, update) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            if self.pid != os.getpid():
+                self.reset()
+            self.values[key] = update(self.values.get(key))
+            self.changed = True
+            if self.flusher is None and settings.METRICS_DIR:
+                self.flusher = threading.Thread(
+                    target=self._flush_periodically,
+                    name='metrics-flush',
+                    daemon=True,
+                )
+                self.flusher.start()
+
+    def _flush_periodically(self) -> None:
+        stopped = self.stopped
+        while not stopped.wait(METRICS_FLUSH_INTERVAL):
+            self.flush()
+            retire_snapshots()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        self._update(name, labels, lambda current: (current or 0) + value)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        buckets = METRICS[name][2]
+
+        def update(current: Optional[list]) -> list:
+            current = current or [0] * (len(buckets) + 1) + [0]
+            current[bisect_left(buckets, value)] += 1
+            current[-1] += value
+            return current
+
+        self._update(name, labels, update)
+
+    def snapshot(self) -> list:
+        with self.lock:
+            if self.pid != os.getpid():
+                self.reset()
+            return [
+                [name, labels, value.copy() if isinstance(value, list)
+                 else value]
+                for (name, labels), value in self.values.items()
+            ]
+
+    def flush(self) -> None:
+        directory = settings.METRICS_DIR
+        if not directory or not self.changed:
+            return
+        self.changed = False
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        _write_json(directory / f'{self.name}.json', self.snapshot())
+
+    def close(self) -> None:
+        """Останавливает фоновый сброс и записывает последний снимок."""
+        self.stopped.set()
+        self.flush()
+
+
+registry = Registry()
+inc = registry.inc
+observe = registry.observe
+atexit.register(registry.close)
+
+
+def _read_json(path: Path, default=None):
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path: Path, data) -> None:
+    temporary = path.with_suffix('.tmp')
+    temporary.write_text(json.dumps(data), encoding='utf-8')
+    os.replace(temporary, path)
+
+
+def _process_alive(name: str) -> bool:
+    """Работает ли процесс, записавший снимок с именем ``name``."""
+    try:
+        pid = int(name.split('-', 1)[0])
+    except ValueError:
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class _DirectoryLock:
+    """Блокировка каталога метрик между процессами."""
+
+    def __init__(self, directory: Path, blocking: bool = True):
+        self.path = directory / LOCK_NAME
+        self.flags = locks.LOCK_EX if blocking else (
+            locks.LOCK_EX | locks.LOCK_NB
+        )
+
+    def __enter__(self) -> bool:
+        self.file = open(self.path, 'ab')
+        return locks.lock(self.file, self.flags)
+
+    def __exit__(self, *exc_info) -> None:
+        locks.unlock(self.file)
+        self.file.close()
+
+
+def retire_snapshots() -> None:
+    """Складывает снимки завершившихся процессов в файл RETIRED_NAME.
+
+    Общий файл записывается раньше, чем удаляются сложенные снимки, и
+    хранит их имена: снимок, который не успели удалить, не учитывается
+    дважды и удаляется при следующем проходе.
+    """
+    if not settings.METRICS_DIR:
+        return
+    directory = Path(settings.METRICS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    with _DirectoryLock(directory, blocking=False) as locked:
+        if not locked:
+            return
+        retired_path = directory / f'{RETIRED_NAME}.json'
+        retired = _read_json(retired_path, {'metrics': [], 'folded': []})
+        for name in retired['folded']:
+            (directory / f'{name}.json').unlink(missing_ok=True)
+        dead = [
+            path for path in directory.glob('*.json')
+            if path.stem != RETIRED_NAME and not _process_alive(path.stem)
+        ]
+        for path in directory.glob('*.tmp'):
+            if not _process_alive(path.stem):
+                path.unlink(missing_ok=True)
+        if not dead and not retired['folded']:
+            return
+        merged = _merge([
+            retired['metrics'],
+            *(_read_json(path, []) for path in dead),
+        ])
+        _write_json(retired_path, {
+            'metrics': [
+                [name, labels, value]
+                for (name, labels), value in merged.items()
+            ],
+            'folded': [path.stem for path in dead],
+        })
+        for path in dead:
+            path.unlink(missing_ok=True)
+
+
+def _snapshots() -> Iterable[list]:
+    yield registry.snapshot()
+    if not settings.METRICS_DIR:
+        return
+    directory = Path(settings.METRICS_DIR)
+    if not directory.is_dir():
+        return
+    with _DirectoryLock(directory):
+        retired = _read_json(
+            directory / f'{RETIRED_NAME}.json',
+            {'metrics': [], 'folded': []},
+        )
+        yield retired['metrics']
+        skipped = {registry.name, RETIRED_NAME, *retired['folded']}
+        for path in directory.glob('*.json'):
+            if path.stem not in skipped:
+                yield _read_json(path, [])
+
+
+def _merge(snapshots: Iterable[list]) -> dict:
+    merged = {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot:
+            key = (name, tuple(tuple(label) for label in labels))
+            current = merged.get(key)
+            if current is None:
+                merged[key] = value
+            elif isinstance(value, list):
+                merged[key] = [a + b for a, b in zip(current, value)]
+            else:
+                merged[key] = current + value
+    return merged
+
+
+def collect() -> dict:
+    """Метрики всех процессов, сложенные по имени и меткам."""
+    return _merge(_snapshots())
+
+
+def _labels(labels: Iterable[tuple[str, str]]) -> str:
+    pairs = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace(
+            '"', '\\"',
+        ).replace('\n', '\\n'))
+        for name, value in labels
+    )
+    return f'{{{pairs}}}' if pairs else ''
+
+
+def render(merged: dict) -> str:
+    """Метрики в текстовом формате Prometheus."""
+    lines = []
+    for name, (kind, description, buckets) in METRICS.items():
+        lines += [f'# HELP {name} {description}', f'# TYPE {name} {kind}']
+        for (metric, labels), value in sorted(merged.items()):
+            if metric != name:
+                continue
+            if kind == 'counter':
+                lines.append(f'{name}{_labels(labels)} {value}')
+                continue
+            total = 0
+            for bound, count in zip((*buckets, '+Inf'), value):
+                total += count
+                lines.append(
+                    f'{name}_bucket{_labels((*labels, ("le", bound)))} '
+                    f'{total}'
+                )
+            lines.append(f'{name}_sum{_labels(labels)} {value[-1]}')
+            lines.append(f'{name}_count{_labels(labels)} {total}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_allowed(request: HttpRequest) -> bool:
+    """Запрос с METRICS_TOKEN или с адреса из METRICS_ALLOWED_IPS."""
+    token = settings.METRICS_TOKEN
+    if token and constant_time_compare(
+        request.META.get('HTTP_AUTHORIZATION', ''),
+        f'Bearer {token}',
+    ):
+        return True
+    return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Метрики для Prometheus, доступные только мониторингу."""
+    if not metrics_allowed(request):
+        raise Http404
+    return HttpResponse(render(collect()), content_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """Время ответа по классу view."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        match = request.resolver_match
+        if match is not None:
+            view = getattr(match.func, 'view_class', match.func)
+            observe(
+                'blog_view_duration_seconds',
+                time.perf_counter() - start,
+                view=getattr(view, '__name__', type(view).__name__),
+            )
+        return response
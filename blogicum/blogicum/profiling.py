@@ -0,0 +1,171 @@
+import logging
+import re
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+from django.template.loader_tags import IncludeNode
+
+from blogicum.constants import TEMPLATE_PROFILE_ENTRIES
+
+# Символы, недопустимые в имени метрики Server-Timing.
+NOT_TOKEN = re.compile(r'[^\w.-]')
+
+logger = logging.getLogger(__name__)
+
+_profile = ContextVar('render_profile', default=None)
+_installed = False
+
+
+class RenderProfile:
+    """Время и число отрисовок шаблонов и тегов include за запрос."""
+
+    def __init__(self):
+        self.timings = defaultdict(lambda: [0, 0.0])
+        self.labels = {}
+        self.queries = 0
+        self.query_time = 0.0
+        self.render_time = 0.0
+        self.depth = 0
+
+    def record(self, key: str, label: str, seconds: float) -> None:
+        timing = self.timings[key]
+        timing[0] += 1
+        timing[1] += seconds
+        self.labels[key] = label
+        if not self.depth:
+            self.render_time += seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_time += time.perf_counter() - start
+
+    def as_dict(self) -> dict:
+        return {
+            'queries': self.queries,
+            'query_ms': round(self.query_time * 1000, 2),
+            'render_ms': round(self.render_time * 1000, 2),
+            'templates': {
+                self.labels[key]: {
+                    'count': count,
+                    'ms': round(seconds * 1000, 2),
+                }
+                for key, (count, seconds) in self.timings.items()
+            },
+        }
+
+    def server_timing(self, limit: int) -> str:
+        entries = [
+            f'db;dur={self.query_time * 1000:.2f};desc="{self.queries}x"',
+        ]
+        slowest = sorted(
+            self.timings.items(),
+            key=lambda item: item[1][1],
+            reverse=True,
+        )[:limit]
+        for key, (count, seconds) in slowest:
+            name = NOT_TOKEN.sub('.', key)
+            label = self.labels[key].replace('\\', '/').replace('"', "'")
+            entries.append(
+                f'{name};dur={seconds * 1000:.2f};desc="{label} {count}x"'
+            )
+        return ', '.join(entries)
+
+
+def _template_key(template: Template) -> tuple[str, str]:
+    name = template.name or '<string>'
+    return f'tpl.{name}', name
+
+
+def _include_key(node: IncludeNode) -> tuple[str, str]:
+    key = getattr(node, '_profile_key', None)
+    if key is None:
+        origin = getattr(getattr(node, 'origin', None), 'template_name', None)
+        token = getattr(node, 'token', None)
+        line = token.lineno if token else 0
+        bits = token.split_contents() if token else []
+        target = bits[1].strip('\'"') if len(bits) > 1 else '?'
+        key = node._profile_key = (
+            f'inc.{origin}.{line}',
+            f'{origin}:{line} {target}',
+        )
+    return key
+
+
+def _timed(render, get_key):
+    @wraps(render)
+    def timed_render(self, context):
+        profile = _profile.get()
+        if profile is None:
+            return render(self, context)
+        profile.depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            seconds = time.perf_counter() - start
+            profile.depth -= 1
+            profile.record(*get_key(self), seconds)
+    return timed_render
+
+
+def install() -> None:
+    """Подключает замеры к отрисовке шаблонов и тегу include."""
+    global _installed
+    if _installed:
+        return
+    Template.render = _timed(Template.render, _template_key)
+    IncludeNode.render = _timed(IncludeNode.render, _include_key)
+    _installed = True
+
+
+@contextmanager
+def profiled():
+    """Собирает профиль запроса; вложенные вызовы получают тот же профиль."""
+    profile = _profile.get()
+    if profile is not None:
+        yield profile
+        return
+    profile = RenderProfile()
+    token = _profile.set(profile)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            yield profile
+    finally:
+        _profile.reset(token)
+
+
+class TemplateProfilingMiddleware:
+    """Отдаёт время отрисовки шаблонов в заголовке Server-Timing."""
+
+    def __init__(self, get_response):
+        if not settings.TEMPLATE_PROFILING:
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with profiled() as profile:
+            response = self.get_response(request)
+        response['Server-Timing'] = profile.server_timing(
+            TEMPLATE_PROFILE_ENTRIES,
+        )
+        logger.info(
+            'Отрисовка %s %s',
+            request.method,
+            request.path,
+            extra={'render_profile': profile.as_dict()},
+        )
+        return response
@@ -0,0 +1,54 @@
+import json
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from blogicum.profiling import install, profiled
+
+logger = logging.getLogger(__name__)
+
+
+class RequestLogMiddleware:
+    """Пишет одну JSON-строку на запрос к страницам `blog` и `pages`."""
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_LOG:
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+        self.namespaces = set(settings.REQUEST_LOG_NAMESPACES)
+        self.sample_rate = settings.REQUEST_LOG_SAMPLE_RATE
+        self.slow_seconds = settings.REQUEST_LOG_SLOW_MS / 1000
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with profiled() as profile:
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+        match = request.resolver_match
+        if match is None or not self.namespaces & set(match.namespaces):
+            return response
+        slow = duration >= self.slow_seconds
+        if not slow and random.random() >= self.sample_rate:
+            return response
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name,
+                'status': response.status_code,
+                'duration_ms': round(duration * 1000, 2),
+                'queries': profile.queries,
+                'query_ms': round(profile.query_time * 1000, 2),
+                'render_ms': round(profile.render_time * 1000, 2),
+                'bytes': (
+                    None if response.streaming else len(response.content)
+                ),
+                'slow': slow,
+            }, ensure_ascii=False),
+        )
+        return response
@@ -10,25 +10,56 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_list(name: str, default: list) -> list:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+# Профиль окружения: development (по умолчанию) или production.
+BLOGICUM_ENV = os.getenv('BLOGICUM_ENV', 'development')
+
+PRODUCTION = BLOGICUM_ENV == 'production'
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/3.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-@q7jv@r5zxre-0=(oosjl)!+j1b+xa@63&c&b419og)&qt$du6'
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    if PRODUCTION:
+        raise ImproperlyConfigured(
+            'В production нужно задать DJANGO_SECRET_KEY.'
+        )
+    SECRET_KEY = (
+        'django-insecure-@q7jv@r5zxre-0=(oosjl)!+j1b+xa@63&c&b419og)&qt$du6'
+    )
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = env_bool('DJANGO_DEBUG', not PRODUCTION)
 
-ALLOWED_HOSTS = [
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', [
     'localhost',
     '127.0.0.1',
-]
+])
 
 
 # Application definition
@@ -43,10 +74,12 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django_bootstrap5',
-    'debug_toolbar',
 ]
 
 MIDDLEWARE = [
+    'blogicum.metrics.MetricsMiddleware',
+    'blogicum.requestlog.RequestLogMiddleware',
+    'blogicum.profiling.TemplateProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,19 +87,62 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+if DEBUG:
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
 ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
+# Каталог, через который процессы обмениваются метриками для /metrics/.
+# Без него эндпоинт отдаёт метрики только обслужившего запрос процесса.
+METRICS_DIR = os.getenv('METRICS_DIR') or (
+    str(Path(tempfile.gettempdir()) / 'blogicum-metrics')
+    if PRODUCTION else None
+)
+
+# /metrics/ доступен с заголовком «Authorization: Bearer <METRICS_TOKEN>»
+# или с адресов METRICS_ALLOWED_IPS. За прокси на том же сервере все
+# запросы приходят с 127.0.0.1, поэтому в production список по умолчанию
+# пуст.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = env_list(
+    'METRICS_ALLOWED_IPS',
+    [] if PRODUCTION else ['127.0.0.1'],
+)
+
+# Журнал запросов: одна JSON-строка на запрос к страницам из
+# REQUEST_LOG_NAMESPACES. Запросы медленнее REQUEST_LOG_SLOW_MS пишутся
+# всегда, остальные — с вероятностью REQUEST_LOG_SAMPLE_RATE.
+REQUEST_LOG = env_bool('REQUEST_LOG', PRODUCTION)
+REQUEST_LOG_NAMESPACES = env_list('REQUEST_LOG_NAMESPACES', ['blog', 'pages'])
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv('REQUEST_LOG_SAMPLE_RATE', '0.1'))
+REQUEST_LOG_SLOW_MS = float(os.getenv('REQUEST_LOG_SLOW_MS', '500'))
+
+# Время отрисовки шаблонов и тегов include в заголовке Server-Timing.
+TEMPLATE_PROFILING = env_bool('TEMPLATE_PROFILING', False)
+
+# Скомпилированные шаблоны хранятся в памяти процесса и прогреваются
+# при запуске WSGI-приложения (см. blogicum.warmup).
+TEMPLATE_CACHE = env_bool('DJANGO_TEMPLATE_CACHE', not DEBUG)
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': (
+                [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+                if TEMPLATE_CACHE else TEMPLATE_LOADERS
+            ),
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -83,13 +159,118 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
-DATABASES = {
+# Постоянные соединения: 0 — закрывать после каждого запроса,
+# пустое значение — не закрывать никогда.
+_conn_max_age = os.getenv('DB_CONN_MAX_AGE', '60' if PRODUCTION else '0')
+DB_CONN_MAX_AGE = int(_conn_max_age) if _conn_max_age else None
+
+if os.getenv('DB_ENGINE', 'sqlite') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'blogicum'),
+            'USER': os.getenv('POSTGRES_USER', 'blogicum'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            # За пулом соединений PgBouncer в режиме transaction
+            # серверные курсоры iterator() недоступны.
+            'DISABLE_SERVER_SIDE_CURSORS': env_bool('DB_POOLER', False),
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'blogicum.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'OPTIONS': {
+                'timeout': 20,
+            },
+            'PRAGMAS': {
+                'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'wal'),
+                'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'normal'),
+                'busy_timeout': 20000,
+                'temp_store': 'memory',
+                'cache_size': -64000,
+                'mmap_size': 256 * 1024 * 1024,
+            },
+            # С DEFERRED транзакция, которая сначала читает, а потом
+            # пишет (publish_scheduled, import_dump, пересчёт счётчиков),
+            # сразу получает «database is locked», если между чтением
+            # и записью закоммитил другой писатель: busy_timeout здесь не
+            # помогает. IMMEDIATE ждёт блокировку в начале транзакции;
+            # на bench_comment_writes пропускная способность одинакова.
+            'TRANSACTION_MODE': os.getenv(
+                'SQLITE_TRANSACTION_MODE',
+                'IMMEDIATE',
+            ),
+        }
+    }
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+# Версии групп страниц хранятся в кэше, поэтому он должен быть общим для
+# всех процессов: воркеров, publish_scheduled, import_dump и других команд.
+# Файловый кэш хранит pickle страниц, поэтому в production его каталог
+# задаётся явно и должен быть доступен только пользователю приложения.
+LOCMEM_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+CACHE_LOCATION = os.getenv('DJANGO_CACHE_LOCATION')
+if PRODUCTION and not CACHE_LOCATION:
+    raise ImproperlyConfigured(
+        'В production нужно задать DJANGO_CACHE_LOCATION.'
+    )
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.getenv(
+            'DJANGO_CACHE_BACKEND',
+            'blogicum.backends.cache.filebased.FileBasedCache',
+        ),
+        'LOCATION': CACHE_LOCATION or str(BASE_DIR / 'cache'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+            'CULL_EVERY': 100,
+        },
     }
 }
 
+if PRODUCTION and CACHES['default']['BACKEND'] == LOCMEM_CACHE:
+    raise ImproperlyConfigured(
+        'LocMemCache не разделяется между процессами: сброс кэша страниц '
+        'из других воркеров и команд не будет виден.'
+    )
+
+
+# Logging
+# https://docs.djangoproject.com/en/3.2/topics/logging/
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {
+            'format': '%(message)s',
+        },
+    },
+    'handlers': {
+        'requests': {
+            'class': 'logging.StreamHandler',
+            'stream': 'ext://sys.stdout',
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'blogicum.requestlog': {
+            'handlers': ['requests'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -5,9 +5,12 @@ from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from blogicum.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('blog.urls', namespace='blog')),
+    path('api/', include('blog.api_urls', namespace='api')),
     path('pages/', include('pages.urls', namespace='pages')),
     path('auth/', include('django.contrib.auth.urls')),
     path(
@@ -18,6 +21,7 @@ urlpatterns = [
             success_url=reverse_lazy('blog:index'),
         ),
         name='registration'),
+    path('metrics/', metrics_view, name='metrics'),
 ]
 if settings.DEBUG:
     import debug_toolbar
@@ -0,0 +1,44 @@
+import logging
+import time
+
+from django.conf import settings
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+
+logger = logging.getLogger(__name__)
+
+
+def template_names() -> list[str]:
+    """Имена всех шаблонов из каталога templates/."""
+    return sorted(
+        path.relative_to(settings.TEMPLATES_DIR).as_posix()
+        for path in settings.TEMPLATES_DIR.rglob('*')
+        if path.is_file()
+    )
+
+
+def uses_cached_loader() -> bool:
+    return any(
+        isinstance(loader, CachedLoader)
+        for loader in engines['django'].engine.template_loaders
+    )
+
+
+def warm_templates() -> list[tuple[str, float]]:
+    """Компилирует шаблоны заранее и возвращает время каждого в секундах."""
+    engine = engines['django']
+    timings = []
+    for name in template_names():
+        start = time.perf_counter()
+        engine.get_template(name)
+        timings.append((name, time.perf_counter() - start))
+    for name, seconds in timings:
+        logger.debug(
+            'Шаблон %s скомпилирован за %.2f мс', name, seconds * 1000,
+        )
+    logger.info(
+        'Прогрето шаблонов: %s за %.1f мс',
+        len(timings),
+        sum(seconds for _, seconds in timings) * 1000,
+    )
+    return timings
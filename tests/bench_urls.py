@@ -0,0 +1,201 @@
+"""Регрессионный бенчмарк маршрутов `blog`, `api` и `pages`.
+
+Запуск (файл не собирается при обычном прогоне тестов):
+
+    pytest tests/bench_urls.py -s
+
+Переменные окружения:
+    BENCH_POSTS — число публикаций в синтетической базе (200);
+    BENCH_COMMENTS — число комментариев к замеряемой публикации (40);
+    BENCH_REPEAT — число замеров каждого маршрута (10);
+    BENCH_LATENCY_TOLERANCE — допустимый рост p95 в разах (2.0);
+    BENCH_BYTES_TOLERANCE — допустимый рост размера ответа в долях (0.1);
+    BENCH_UPDATE_BASELINE=1 — перезаписать baseline текущими результатами.
+"""
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from blog import api_urls, urls as blog_urls
+from pages import urls as pages_urls
+
+pytestmark = [pytest.mark.django_db]
+
+BASELINE_PATH = Path(__file__).parent / "bench_baseline.json"
+POSTS = int(os.getenv("BENCH_POSTS", 200))
+COMMENTS = int(os.getenv("BENCH_COMMENTS", 40))
+REPEAT = int(os.getenv("BENCH_REPEAT", 10))
+LATENCY_TOLERANCE = float(os.getenv("BENCH_LATENCY_TOLERANCE", 2.0))
+LATENCY_SLACK_MS = 5.0
+BYTES_TOLERANCE = float(os.getenv("BENCH_BYTES_TOLERANCE", 0.1))
+UPDATE_BASELINE = os.getenv("BENCH_UPDATE_BASELINE") == "1"
+# Маршруты, которые принимают только POST, замеряются отправкой формы.
+POST_DATA = {
+    "blog:add_comment": {"text": "Комментарий из бенчмарка"},
+}
+
+
+@pytest.fixture
+def bench_data(
+        mixer, user, another_user, published_category, published_locations):
+    posts = mixer.cycle(POSTS).blend(
+        "blog.Post",
+        author=mixer.sequence(user, another_user),
+        category=published_category,
+        location=mixer.sequence(*published_locations),
+        title=mixer.sequence("Публикация {0}"),
+        text="Текст синтетической публикации для бенчмарка.",
+    )
+    post = posts[0]
+    comments = mixer.cycle(COMMENTS).blend(
+        "blog.Comment",
+        post=post,
+        author=user,
+        text=mixer.sequence("Комментарий {0}"),
+    )
+    return {
+        "post_id": post.id,
+        "comment_id": comments[0].id,
+        "username": user.username,
+        "category_slug": published_category.slug,
+    }
+
+
+def iter_routes(url_kwargs: dict):
+    for module in (blog_urls, api_urls, pages_urls):
+        for pattern in module.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            converters = pattern.pattern.converters
+            yield (
+                f"{module.app_name}:{pattern.name}",
+                reverse(
+                    f"{module.app_name}:{pattern.name}",
+                    kwargs={key: url_kwargs[key] for key in converters},
+                ),
+            )
+
+
+def read_body(response) -> bytes:
+    if response.streaming:
+        return b"".join(response.streaming_content)
+    return response.content
+
+
+def request(client: Client, route: str, url: str):
+    if route in POST_DATA:
+        return client.post(url, POST_DATA[route])
+    return client.get(url)
+
+
+def measure(client: Client, route: str, url: str) -> dict:
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = request(client, route, url)
+        body = read_body(response)
+    query_count = len(queries)
+    timings = []
+    for _ in range(REPEAT):
+        cache.clear()
+        start = time.perf_counter()
+        read_body(request(client, route, url))
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "status": response.status_code,
+        "queries": query_count,
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[int(0.95 * (len(timings) - 1))], 2),
+        "bytes": len(body),
+    }
+
+
+def compare(name: str, result: dict, baseline: dict) -> list:
+    problems = []
+    if result["status"] != baseline["status"]:
+        problems.append(
+            f"{name}: статус {baseline['status']} -> {result['status']}"
+        )
+    if result["queries"] > baseline["queries"]:
+        problems.append(
+            f"{name}: запросов к БД {baseline['queries']}"
+            f" -> {result['queries']}"
+        )
+    latency_limit = (
+        baseline["p95_ms"] * LATENCY_TOLERANCE + LATENCY_SLACK_MS
+    )
+    if result["p95_ms"] > latency_limit:
+        problems.append(
+            f"{name}: p95 {baseline['p95_ms']} мс -> {result['p95_ms']} мс"
+        )
+    if result["bytes"] > baseline["bytes"] * (1 + BYTES_TOLERANCE):
+        problems.append(
+            f"{name}: размер ответа {baseline['bytes']}"
+            f" -> {result['bytes']} байт"
+        )
+    return problems
+
+
+def test_urls_benchmark(bench_data, user, another_user):
+    author_client = Client(raise_request_exception=False)
+    author_client.force_login(user)
+    another_client = Client(raise_request_exception=False)
+    another_client.force_login(another_user)
+    clients = {
+        "anonymous": Client(raise_request_exception=False),
+        "author": author_client,
+        "non-author": another_client,
+    }
+
+    results = {}
+    for route, url in iter_routes(bench_data):
+        for client_name, client in clients.items():
+            results[f"{route}[{client_name}]"] = measure(
+                client, route, url,
+            )
+
+    print()
+    print(f"{'маршрут':<45}{'код':>5}{'SQL':>5}{'p50':>9}{'p95':>9}"
+          f"{'байт':>9}")
+    for name, result in results.items():
+        print(
+            f"{name:<45}{result['status']:>5}{result['queries']:>5}"
+            f"{result['p50_ms']:>9}{result['p95_ms']:>9}{result['bytes']:>9}"
+        )
+
+    errors = [
+        f"{name}: статус {result['status']}"
+        for name, result in results.items()
+        if result["status"] >= 500
+    ]
+    assert not errors, (
+        "Маршруты не должны отвечать ошибкой сервера:\n" + "\n".join(errors)
+    )
+
+    if UPDATE_BASELINE or not BASELINE_PATH.exists():
+        BASELINE_PATH.write_text(
+            json.dumps(results, indent=2, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+        return
+
+    baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    problems = []
+    for name, result in results.items():
+        if name in baseline:
+            problems += compare(name, result, baseline[name])
+        else:
+            print(f"Нет baseline для {name}")
+    assert not problems, (
+        "Производительность маршрутов ухудшилась относительно"
+        f" {BASELINE_PATH.name}:\n" + "\n".join(problems)
+    )
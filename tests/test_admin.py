@@ -0,0 +1,84 @@
+import pytest
+from django.db import connection
+from django.db.models import Model
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+from blog.paginators import EstimatedCountPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _changelist_queries(client: Client, url: str) -> int:
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.parametrize("url", ["/admin/blog/post/", "/admin/blog/comment/"])
+def test_changelist_queries_do_not_grow_with_rows(
+        admin_client: Client, mixer, post_with_published_location: Model,
+        url: str):
+    mixer.blend("blog.Comment", post=post_with_published_location)
+    few = _changelist_queries(admin_client, url)
+    posts = mixer.cycle(5).blend(
+        "blog.Post",
+        category=post_with_published_location.category,
+        location=post_with_published_location.location,
+    )
+    mixer.cycle(5).blend("blog.Comment", post=mixer.sequence(*posts))
+    assert _changelist_queries(admin_client, url) <= few, (
+        "Убедитесь, что число запросов списка в админке не зависит от числа"
+        " строк на странице."
+    )
+
+
+def test_post_changelist_uses_search_index(
+        admin_client: Client, post_with_published_location: Model):
+    post = post_with_published_location
+    post.title = "Восхождение на Эльбрус"
+    post.save()
+    response = admin_client.get("/admin/blog/post/", {"q": "эльбрус"})
+    assert list(response.context["cl"].result_list) == [post]
+    response = admin_client.get("/admin/blog/post/", {"q": "Казбек"})
+    assert list(response.context["cl"].result_list) == []
+
+
+def test_estimated_count_paginator(many_posts_with_published_locations):
+    posts = Post.objects.order_by("pk")
+    exact = posts.count()
+    latest = posts.last().pk
+    posts.first().delete()
+    paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+    assert paginator.count == exact - 1, (
+        "Убедитесь, что для небольших таблиц число объектов считается точно."
+    )
+    paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+    paginator.estimate_threshold = 1
+    assert paginator.count == latest, (
+        "Убедитесь, что для больших таблиц без фильтров число объектов"
+        " оценивается без COUNT(*)."
+    )
+    paginator = EstimatedCountPaginator(
+        Post.objects.filter(pk__lt=latest), 10,
+    )
+    paginator.estimate_threshold = 1
+    assert paginator.count == exact - 2
+
+
+def test_admin_comment_delete_updates_counter(
+        admin_client: Client, mixer, post_with_published_location: Model):
+    post = post_with_published_location
+    comments = mixer.cycle(2).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=2)
+    admin_client.post(
+        f"/admin/blog/comment/{comments[0].pk}/delete/", {"post": "yes"},
+    )
+    assert not Comment.objects.filter(pk=comments[0].pk).exists()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что удаление комментария в админке обновляет счётчик"
+        " комментариев публикации."
+    )
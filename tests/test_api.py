@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from django.db.models import Model
+from django.test.client import Client
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_api_feed_cursor_pagination(
+        client: Client, many_posts_with_published_locations,
+        unpublished_posts_with_published_locations):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    data = client.get("/api/posts/").json()
+    assert [post["id"] for post in data["results"]] == [
+        post.id for post in expected[:N_PER_PAGE]
+    ], "Убедитесь, что API ленты возвращает опубликованные записи по дате."
+    assert data["previous"] is None
+    second = client.get(data["next"]).json()
+    assert [post["id"] for post in second["results"]] == [
+        post.id for post in expected[N_PER_PAGE:N_PER_PAGE * 2]
+    ]
+    assert second["next"] is None
+    assert client.get("/api/posts/", {"after": "broken"}).status_code == 400
+
+
+def test_api_field_selection(
+        client: Client, post_with_published_location: Model):
+    data = client.get("/api/posts/", {"fields": "id,title,author"}).json()
+    assert data["results"] == [{
+        "id": post_with_published_location.id,
+        "title": post_with_published_location.title,
+        "author": post_with_published_location.author.username,
+    }], "Убедитесь, что API возвращает только поля из параметра fields."
+    assert client.get("/api/posts/", {"fields": "password"}).status_code == 400
+
+
+def test_api_respects_visibility(
+        client: Client, user_client: Client,
+        unpublished_posts_with_published_locations):
+    post = unpublished_posts_with_published_locations[0]
+    assert client.get(f"/api/posts/{post.id}/").status_code == 404, (
+        "Убедитесь, что API не отдаёт неопубликованные записи посторонним."
+    )
+    assert user_client.get(f"/api/posts/{post.id}/").status_code == 200
+    username = post.author.username
+    assert client.get(f"/api/profiles/{username}/posts/").json()[
+        "results"
+    ] == []
+    owner_results = user_client.get(
+        f"/api/profiles/{username}/posts/"
+    ).json()["results"]
+    assert len(owner_results) == len(
+        unpublished_posts_with_published_locations
+    )
+
+
+def test_api_category(client: Client, post_with_published_location: Model):
+    slug = post_with_published_location.category.slug
+    categories = client.get("/api/categories/").json()["results"]
+    assert {"slug": slug} in [
+        {"slug": category["slug"]} for category in categories
+    ]
+    posts = client.get(f"/api/categories/{slug}/posts/").json()["results"]
+    assert [post["id"] for post in posts] == [post_with_published_location.id]
+    assert client.get("/api/categories/unknown/posts/").status_code == 404
+
+
+def test_api_streams_comments(
+        client: Client, mixer, post_with_published_location: Model):
+    post = post_with_published_location
+    comments = mixer.cycle(5).blend("blog.Comment", post=post)
+    detail = client.get(f"/api/posts/{post.id}/").json()
+    response = client.get(detail["comments"])
+    assert response.streaming, (
+        "Убедитесь, что комментарии отдаются потоковым ответом."
+    )
+    data = json.loads(b"".join(response.streaming_content))
+    assert [comment["id"] for comment in data] == [
+        comment.id
+        for comment in sorted(comments, key=lambda c: (c.created_at, c.id))
+    ]
+
+
+@pytest.mark.parametrize(("method", "url", "status"), [
+    ("get", "/api/categories/unknown/posts/", 404),
+    ("get", "/api/profiles/unknown/posts/", 404),
+    ("get", "/api/posts/0/", 404),
+    ("get", "/api/posts/0/comments/", 404),
+    ("get", "/api/posts/?limit=many", 400),
+    ("post", "/api/posts/", 405),
+])
+def test_api_errors_are_json(client: Client, method: str, url: str,
+                             status: int):
+    response = getattr(client, method)(url)
+    assert response.status_code == status
+    assert response["Content-Type"] == "application/json", (
+        "Убедитесь, что все ошибки API отдаются в формате JSON."
+    )
+    assert set(response.json()) == {"detail"}
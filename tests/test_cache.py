@@ -0,0 +1,264 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.db.models import Model
+from django.test.client import Client
+
+MANAGE_PY = Path(__file__).resolve().parent.parent / "blogicum" / "manage.py"
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_pages_are_cached(
+        client: Client, post_with_published_location: Model,
+        django_assert_num_queries):
+    post = post_with_published_location
+    urls = (
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        first = client.get(url)
+        assert first.status_code == 200
+        with django_assert_num_queries(0):
+            second = client.get(url)
+        assert second.content == first.content, (
+            f"Убедитесь, что страница `{url}` для анонимных пользователей"
+            " отдаётся из кэша."
+        )
+
+
+def test_authenticated_pages_are_not_cached(
+        user_client: Client, post_with_published_location: Model):
+    user_client.get("/")
+    post_with_published_location.__class__.objects.filter(
+        pk=post_with_published_location.pk
+    ).update(title="Обновлённый заголовок")
+    assert "Обновлённый заголовок" in user_client.get("/").content.decode()
+
+
+def test_comment_evicts_post_pages(
+        client: Client, mixer, post_with_published_location: Model,
+        django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    detail_url = f"/posts/{post.id}/"
+    client.get(detail_url)
+    client.get("/")
+    with django_capture_on_commit_callbacks(execute=True):
+        comment = mixer.blend(
+            "blog.Comment", post=post, text="Свежий комментарий",
+        )
+    assert comment.text in client.get(detail_url).content.decode()
+
+
+def test_post_save_evicts_only_related_pages(
+        client: Client, post_with_published_location: Model,
+        post_with_another_category: Model, django_assert_num_queries):
+    post = post_with_published_location
+    other = post_with_another_category
+    client.get(f"/posts/{other.id}/")
+    client.get(f"/category/{other.category.slug}/")
+
+    post.title = "Новый заголовок"
+    post.save()
+
+    assert post.title in client.get("/").content.decode()
+    assert post.title in client.get(f"/posts/{post.id}/").content.decode()
+    with django_assert_num_queries(0):
+        client.get(f"/posts/{other.id}/")
+        client.get(f"/category/{other.category.slug}/")
+
+
+def test_unchanged_pages_answer_not_modified(
+        client: Client, post_with_published_location: Model,
+        django_assert_num_queries, django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    urls = (
+        "/",
+        f"/posts/{post.id}/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+    )
+    for url in urls:
+        response = client.get(url)
+        assert not response.has_header("Last-Modified"), (
+            "Убедитесь, что страницы не отдают Last-Modified: несколько"
+            " изменений за одну секунду дают одинаковую дату."
+        )
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == 304, (
+            f"Убедитесь, что страница `{url}` отвечает 304 Not Modified на"
+            " запрос с актуальным ETag."
+        )
+
+    etag = client.get(urls[1])["ETag"]
+    post.title = "Исправленный заголовок"
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    assert client.get(urls[1], HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что после изменения публикации ETag страницы меняется."
+    )
+
+
+def test_pages_are_evicted_after_commit(
+        client: Client, post_with_published_location: Model,
+        django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    etag = client.get(url)["ETag"]
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = "Заголовок до фиксации"
+        post.save()
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag,
+        ).status_code == 304, (
+            "Убедитесь, что кэш страниц сбрасывается только после фиксации"
+            " транзакции, иначе в него попадут незафиксированные данные."
+        )
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_username_change_evicts_author_pages(
+        client: Client, user_client: Client, user,
+        post_with_published_location: Model,
+        django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    old_profile_url = f"/profile/{user.username}/"
+    urls = ("/", f"/posts/{post.id}/", f"/category/{post.category.slug}/")
+    etags = {url: client.get(url)["ETag"] for url in urls}
+    assert client.get(old_profile_url).status_code == 200
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post("/profile/edit/", {
+            "username": "renamed_author",
+            "email": "renamed@example.com",
+        })
+    user.refresh_from_db()
+    assert user.username == "renamed_author"
+    for url in urls:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+        assert response.status_code == 200, (
+            f"Убедитесь, что после смены имени автора страница `{url}`"
+            " сбрасывается из кэша."
+        )
+        assert "renamed_author" in response.content.decode()
+    assert client.get(old_profile_url).status_code == 404, (
+        "Убедитесь, что после смены имени пользователя его прежний профиль"
+        " не отдаётся из кэша."
+    )
+
+
+def test_location_change_evicts_post_pages(
+        client: Client, post_with_published_location: Model,
+        django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    urls = ("/", f"/posts/{post.id}/")
+    etags = {url: client.get(url)["ETag"] for url in urls}
+    location = post.location
+    location.name = "Переименованное место"
+    with django_capture_on_commit_callbacks(execute=True):
+        location.save()
+    for url in urls:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+        assert response.status_code == 200, (
+            f"Убедитесь, что после изменения местоположения страница `{url}`"
+            " сбрасывается из кэша."
+        )
+    assert location.name in client.get(urls[1]).content.decode()
+
+
+def test_etag_depends_on_user(
+        user_client: Client, another_user_client: Client,
+        post_with_published_location: Model):
+    url = f"/posts/{post_with_published_location.id}/"
+    etag = user_client.get(url)["ETag"]
+    assert user_client.get(
+        url, HTTP_IF_NONE_MATCH=etag
+    ).status_code == 304
+    assert another_user_client.get(
+        url, HTTP_IF_NONE_MATCH=etag
+    ).status_code == 200, (
+        "Убедитесь, что ETag страницы различается для разных пользователей."
+    )
+
+
+def test_updated_at_changes_on_save(post_with_published_location: Model):
+    post = post_with_published_location
+    updated_at = post.updated_at
+    post.title = "Другой заголовок"
+    post.save()
+    post.refresh_from_db()
+    assert post.updated_at > updated_at
+
+
+def test_changes_from_another_process_evict_pages(
+        client: Client, post_with_published_location: Model):
+    post = post_with_published_location
+    urls = [f"/posts/{post.id}/", f"/api/posts/{post.id}/"]
+    etags = {url: client.get(url)["ETag"] for url in urls}
+    client.get("/")
+    # Так изменение выглядит для веб-процесса, если его сделал воркер
+    # или команда: запись в БД и сброс версий в другом процессе.
+    post.__class__.objects.filter(pk=post.pk).update(
+        title="Заголовок из другого процесса"
+    )
+    subprocess.run(
+        [
+            sys.executable, str(MANAGE_PY), "shell", "-c",
+            "from blog.cache import FEED_GROUP, invalidate, post_group; "
+            f"invalidate(FEED_GROUP, post_group({post.id}))",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    for url, etag in etags.items():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            "Убедитесь, что сброс кэша в другом процессе меняет ETag"
+            f" страницы {url}."
+        )
+        assert "Заголовок из другого процесса" in response.content.decode()
+    assert "Заголовок из другого процесса" in client.get("/").content.decode()
+
+
+
+@pytest.mark.parametrize(("target", "field", "value", "expected"), [
+    ("post", "title", "Новый заголовок", "Новый заголовок"),
+    ("post", "text", "Новый текст", "Новый текст"),
+    ("post", "comment_count", 42, "Комментарии (42)"),
+    ("post", "image", "post_images/new_photo.jpg", "new_photo.jpg"),
+    ("category", "title", "Новая категория", "Новая категория"),
+    ("location", "name", "Новое место", "Новое место"),
+    ("author", "username", "new_author", "@new_author"),
+], ids=[
+    "title", "text", "comment_count", "image", "category_title", "location",
+    "author",
+])
+def test_post_card_fragment_follows_displayed_fields(
+        user_client: Client, post_with_published_location: Model,
+        target: str, field: str, value, expected: str):
+    post = post_with_published_location
+    assert post.title in user_client.get("/").content.decode()
+    # Изменение без сигналов: авторизованным кэш страниц не отдаётся,
+    # поэтому заново отрисовать карточку может только её версия.
+    obj = post if target == "post" else getattr(post, target)
+    type(obj).objects.filter(pk=obj.pk).update(**{field: value})
+    assert expected in user_client.get("/").content.decode(), (
+        "Убедитесь, что кэш карточки публикации сбрасывается при изменении"
+        f" поля `{target}.{field}`."
+    )
+
+
+def test_post_card_fragment_follows_category_change(
+        user_client: Client, mixer, post_with_published_location: Model):
+    post = post_with_published_location
+    user_client.get("/")
+    category = mixer.blend(
+        "blog.Category", is_published=True, title="Другая категория",
+    )
+    type(post).objects.filter(pk=post.pk).update(category=category)
+    assert category.title in user_client.get("/").content.decode()
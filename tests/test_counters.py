@@ -0,0 +1,128 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Model
+from django.test.client import Client
+
+from blog.models import Category, Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _comment_count(post: Model) -> int:
+    return Post.objects.get(pk=post.pk).comment_count
+
+
+def test_comment_views_keep_comment_count(
+        user_client: Client, post_with_published_location: Model):
+    post_id = post_with_published_location.id
+    for text in ("Первый", "Второй"):
+        user_client.post(f"/posts/{post_id}/comment/", {"text": text})
+    assert _comment_count(post_with_published_location) == 2, (
+        "Убедитесь, что при создании комментария счётчик комментариев"
+        " публикации увеличивается."
+    )
+
+    comment = Comment.objects.filter(post_id=post_id).first()
+    user_client.post(f"/posts/{post_id}/delete_comment/{comment.id}/")
+    assert _comment_count(post_with_published_location) == 1, (
+        "Убедитесь, что при удалении комментария счётчик комментариев"
+        " публикации уменьшается."
+    )
+
+
+def test_recalculate_counters(mixer, post_with_published_location: Model):
+    mixer.cycle(3).blend("blog.Comment", post=post_with_published_location)
+    assert _comment_count(post_with_published_location) == 0
+    call_command("recalculate_counters", stdout=StringIO())
+    assert _comment_count(post_with_published_location) == 3
+
+
+def _published_posts_count(category: Model) -> int:
+    return Category.objects.get(pk=category.pk).published_posts_count
+
+
+def test_category_counts_follow_posts(
+        post_with_published_location: Model, published_category: Model,
+        post_with_another_category: Model):
+    post = post_with_published_location
+    another_category = post_with_another_category.category
+    assert _published_posts_count(published_category) == 1, (
+        "Убедитесь, что при создании опубликованной записи счётчик"
+        " категории увеличивается."
+    )
+
+    post.is_published = False
+    post.save()
+    assert _published_posts_count(published_category) == 0, (
+        "Убедитесь, что снятая с публикации запись не учитывается в"
+        " счётчике категории."
+    )
+
+    post.is_published = True
+    post.category = another_category
+    post.save()
+    assert _published_posts_count(published_category) == 0
+    assert _published_posts_count(another_category) == 2, (
+        "Убедитесь, что при переносе записи в другую категорию счётчики"
+        " обеих категорий обновляются."
+    )
+
+    post.delete()
+    assert _published_posts_count(another_category) == 1, (
+        "Убедитесь, что при удалении записи счётчик категории уменьшается."
+    )
+
+
+def test_recalculate_category_counts(
+        post_with_published_location: Model, published_category: Model):
+    Category.objects.update(published_posts_count=0)
+    call_command("recalculate_counters", stdout=StringIO())
+    assert _published_posts_count(published_category) == 1
+
+
+def test_category_page_uses_stored_count(
+        client: Client, many_posts_with_published_locations,
+        published_category: Model, django_assert_num_queries):
+    url = f"/category/{published_category.slug}/"
+    with django_assert_num_queries(2):
+        response = client.get(url)
+    assert response.context["paginator"].count == len(
+        many_posts_with_published_locations
+    ), (
+        "Убедитесь, что пагинатор страницы категории использует хранимый"
+        " счётчик записей."
+    )
+
+
+def test_category_list_shows_counts(
+        client: Client, post_with_published_location: Model,
+        published_category: Model):
+    response = client.get("/category/")
+    assert response.status_code == 200
+    assert published_category in response.context["category_list"]
+    assert response.context["category_list"][0].published_posts_count == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bench_comment_writes_removes_only_its_data(
+        mixer, user, post_with_published_location: Model):
+    post = post_with_published_location
+    bench_user = mixer.blend("auth.User", username="bench_writer")
+    kept = mixer.blend("blog.Comment", post=post, author=user)
+    out = StringIO()
+    call_command(
+        "bench_comment_writes", "--threads", "1", "--comments", "2",
+        stdout=out,
+    )
+    assert "Записано: 2, ошибок: 0" in out.getvalue()
+    assert bench_user.__class__.objects.filter(pk=bench_user.pk).exists(), (
+        "Убедитесь, что замер не удаляет существующих пользователей."
+    )
+    assert list(Comment.objects.all()) == [kept], (
+        "Убедитесь, что после замера удаляются только комментарии,"
+        " написанные во время замера."
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 1
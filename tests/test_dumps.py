@@ -0,0 +1,215 @@
+import gzip
+import json
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+
+from blog.dumps import iter_dump
+from blog.models import Category, Comment, Location, Post
+from blog.search import get_search_backend, search_terms
+
+pytestmark = [pytest.mark.django_db]
+
+DB_JSON = Path(__file__).resolve().parent.parent / "db.json"
+
+
+def test_iter_dump_reads_in_chunks():
+    items = [{"pk": index, "text": "т" * index} for index in range(50)]
+    stream = StringIO(json.dumps(items, ensure_ascii=False, indent=2))
+    assert list(iter_dump(stream, chunk_size=7)) == items, (
+        "Убедитесь, что потоковый разбор дампа не зависит от размера"
+        " читаемого блока."
+    )
+    assert list(iter_dump(StringIO("[]"))) == []
+    lines = "\n".join(json.dumps(item, ensure_ascii=False) for item in items)
+    assert list(iter_dump(StringIO(lines + "\n"), chunk_size=7)) == items, (
+        "Убедитесь, что дамп в формате JSON Lines тоже читается."
+    )
+    assert list(iter_dump(StringIO(""))) == []
+
+
+def test_import_dump(tmp_path):
+    fixture = json.loads(DB_JSON.read_text(encoding="utf-8"))
+    expected = {
+        label: sum(record["model"] == label for record in fixture)
+        for label in ("blog.category", "blog.location", "blog.post")
+    }
+    dump = tmp_path / "db.json.gz"
+    with gzip.open(dump, "wt", encoding="utf-8") as stream:
+        json.dump(fixture, stream, ensure_ascii=False)
+
+    call_command("import_dump", str(dump), batch_size=7, stdout=StringIO())
+    assert Category.objects.count() == expected["blog.category"]
+    assert Location.objects.count() == expected["blog.location"]
+    assert Post.objects.count() == expected["blog.post"], (
+        "Убедитесь, что команда import_dump загружает все публикации дампа."
+    )
+    assert get_user_model().objects.count() == 4
+
+    first_post = next(
+        record for record in fixture if record["model"] == "blog.post"
+    )
+    post = Post.objects.get(title=first_post["fields"]["title"])
+    assert post.created_at.isoformat().startswith(
+        first_post["fields"]["created_at"][:19]
+    ), "Убедитесь, что при загрузке сохраняется дата создания из дампа."
+    assert post.is_live
+    assert post.category.published_posts_count == Post.objects.filter(
+        category=post.category, is_published=True, is_live=True,
+    ).count()
+    assert post in get_search_backend().search(
+        Post.objects.all(), search_terms(post.title),
+    ), "Убедитесь, что загруженные публикации попадают в поисковый индекс."
+
+    call_command("import_dump", str(dump), stdout=StringIO())
+    assert Category.objects.count() == expected["blog.category"], (
+        "Убедитесь, что категории сопоставляются с существующими по slug."
+    )
+    assert Location.objects.count() == expected["blog.location"], (
+        "Убедитесь, что местоположения сопоставляются с существующими"
+        " по названию."
+    )
+    assert Post.objects.count() == expected["blog.post"], (
+        "Убедитесь, что повторная загрузка дампа не создаёт дубли"
+        " публикаций."
+    )
+
+
+def test_export_dump_round_trip(
+        tmp_path, many_posts_with_published_locations, comment):
+    dump = tmp_path / "export.json.gz"
+    call_command("export_dump", str(dump), stderr=StringIO())
+    with gzip.open(dump, "rt", encoding="utf-8") as stream:
+        records = list(iter_dump(stream))
+    posts = [record for record in records if record["model"] == "blog.post"]
+    assert len(posts) == len(many_posts_with_published_locations) + 1, (
+        "Убедитесь, что команда export_dump выгружает все публикации."
+    )
+    assert {"title", "text", "pub_date", "author", "category"} <= set(
+        posts[0]["fields"]
+    )
+    assert "comment_count" not in posts[0]["fields"]
+
+    Post.objects.all().delete()
+    call_command("import_dump", str(dump), stdout=StringIO())
+    assert Post.objects.count() == len(posts), (
+        "Убедитесь, что выгрузку export_dump можно загрузить командой"
+        " import_dump."
+    )
+
+
+def test_export_dump_since(tmp_path, many_posts_with_published_locations):
+    since = timezone.now() - timedelta(days=1)
+    newest = many_posts_with_published_locations[0]
+    Post.objects.update(created_at=since - timedelta(days=1))
+    Post.objects.filter(pk=newest.pk).update(created_at=timezone.now())
+    dump = tmp_path / "export.jsonl"
+    call_command(
+        "export_dump", str(dump), since=since.isoformat(), stderr=StringIO()
+    )
+    records = [
+        json.loads(line)
+        for line in dump.read_text(encoding="utf-8").splitlines()
+    ]
+    assert [
+        record["pk"] for record in records if record["model"] == "blog.post"
+    ] == [newest.pk], (
+        "Убедитесь, что при указании --since выгружаются только более"
+        " новые публикации."
+    )
+
+
+def test_export_dump_since_date(
+        tmp_path, many_posts_with_published_locations):
+    today = timezone.localdate()
+    newest = many_posts_with_published_locations[0]
+    Post.objects.update(created_at=timezone.now() - timedelta(days=2))
+    Post.objects.filter(pk=newest.pk).update(created_at=timezone.now())
+    dump = tmp_path / "export.jsonl"
+    call_command(
+        "export_dump", str(dump), since=today.isoformat(), stderr=StringIO()
+    )
+    records = [
+        json.loads(line)
+        for line in dump.read_text(encoding="utf-8").splitlines()
+    ]
+    assert [
+        record["pk"] for record in records if record["model"] == "blog.post"
+    ] == [newest.pk], (
+        "Убедитесь, что --since принимает дату без времени и выгружает"
+        " публикации начиная с полуночи этого дня."
+    )
+    with pytest.raises(CommandError):
+        call_command("export_dump", str(dump), since="2020-13-01")
+
+
+@pytest.mark.parametrize("suffix", [".json", ".jsonl", ".jsonl.gz"])
+def test_export_import_round_trip(
+        tmp_path, suffix, many_posts_with_published_locations, comment):
+    dump = tmp_path / f"full{suffix}"
+    call_command("export_dump", str(dump), stderr=StringIO())
+    titles = sorted(Post.objects.values_list("title", flat=True))
+    Post.objects.all().delete()
+    Location.objects.all().delete()
+    call_command("import_dump", str(dump), stdout=StringIO())
+    assert sorted(Post.objects.values_list("title", flat=True)) == titles, (
+        "Убедитесь, что выгрузку export_dump в любом формате можно"
+        " загрузить командой import_dump."
+    )
+    assert Comment.objects.count() == 1
+
+    since = timezone.now()
+    old_post = Post.objects.order_by("created_at").first()
+    new_comment = Comment.objects.create(
+        post=old_post, author=comment.author, text="Новый комментарий",
+    )
+    delta = tmp_path / f"delta{suffix}"
+    call_command(
+        "export_dump", str(delta), since=since.isoformat(), stderr=StringIO()
+    )
+    new_comment.delete()
+    call_command("import_dump", str(delta), stdout=StringIO())
+    assert Post.objects.count() == len(titles)
+    restored = Comment.objects.get(text="Новый комментарий")
+    assert restored.post == old_post, (
+        "Убедитесь, что инкрементальная выгрузка с новым комментарием"
+        " к старой публикации загружается без ошибок."
+    )
+    assert restored.created_at == new_comment.created_at
+    old_post.refresh_from_db()
+    assert old_post.comment_count == old_post.comments.count()
+
+
+def test_import_dump_resumes_after_error(
+        tmp_path, post_with_published_location, comment):
+    dump = tmp_path / "broken.json"
+    call_command("export_dump", str(dump), stderr=StringIO())
+    records = json.loads(dump.read_text(encoding="utf-8"))
+    broken = {
+        "model": "blog.comment", "pk": 1,
+        "fields": {"post": 404, "author": 404, "text": "Без публикации"},
+    }
+    dump.write_text(json.dumps(records + [broken]), encoding="utf-8")
+    posts = Post.objects.count()
+    Post.objects.all().delete()
+    Location.objects.all().delete()
+    with pytest.raises(CommandError):
+        call_command("import_dump", str(dump), stdout=StringIO())
+    assert Post.objects.count() == posts, (
+        "Убедитесь, что записанные пакеты дампа фиксируются, не дожидаясь"
+        " конца загрузки."
+    )
+    assert not Comment.objects.exists()
+
+    dump.write_text(json.dumps(records), encoding="utf-8")
+    call_command("import_dump", str(dump), stdout=StringIO())
+    assert Post.objects.count() == posts
+    post = Post.objects.get(comments__isnull=False)
+    assert post.comments.count() == post.comment_count == 1, (
+        "Убедитесь, что прерванную загрузку можно повторить без дублей."
+    )
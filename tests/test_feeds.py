@@ -0,0 +1,53 @@
+import pytest
+from django.db.models import Model
+from django.test.client import Client
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize("kind", ["rss", "atom"])
+def test_feeds_list_published_posts(
+        kind, client: Client, post_with_published_location: Model,
+        unpublished_posts_with_published_locations):
+    post = post_with_published_location
+    urls = (
+        f"/feed/{kind}/",
+        f"/category/{post.category.slug}/{kind}/",
+        f"/profile/{post.author.username}/{kind}/",
+    )
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert f"/posts/{post.id}/" in content, (
+            f"Убедитесь, что лента `{url}` содержит опубликованные записи."
+        )
+        for hidden in unpublished_posts_with_published_locations:
+            assert f"/posts/{hidden.id}/" not in content
+        assert response.has_header("ETag")
+        assert response.has_header("Last-Modified")
+
+
+def test_unknown_category_feed_is_404(client: Client):
+    assert client.get("/category/unknown/rss/").status_code == 404
+
+
+def test_feed_not_modified_skips_database(
+        client: Client, post_with_published_location: Model,
+        django_assert_num_queries, django_capture_on_commit_callbacks):
+    url = "/feed/atom/"
+    etag = client.get(url)["ETag"]
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        "Убедитесь, что лента отвечает 304 Not Modified на запрос с"
+        " актуальным ETag и не обращается к базе данных."
+    )
+
+    post_with_published_location.title = "Новый заголовок"
+    with django_capture_on_commit_callbacks(execute=True):
+        post_with_published_location.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        "Убедитесь, что после изменения публикации ETag ленты меняется."
+    )
@@ -0,0 +1,167 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from django.core.cache import cache
+from django.db.models import Model
+from django.test import override_settings
+from django.test.client import Client
+
+from blogicum import metrics
+from blogicum.metrics import collect, registry, render
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _value(name: str, **labels):
+    return collect().get((name, tuple(sorted(labels.items()))), 0)
+
+
+def test_comment_operations_are_counted(
+        user_client: Client, post_with_published_location: Model):
+    post = post_with_published_location
+    before = {
+        action: _value("blog_comments_total", action=action)
+        for action in ("create", "edit", "delete")
+    }
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Первый"})
+    comment = post.comments.get()
+    user_client.post(
+        f"/posts/{post.id}/edit_comment/{comment.id}/", {"text": "Второй"},
+    )
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    for action in ("create", "edit", "delete"):
+        assert _value(
+            "blog_comments_total", action=action,
+        ) == before[action] + 1, (
+            "Убедитесь, что создание, редактирование и удаление комментария"
+            " увеличивают счётчик `blog_comments_total`."
+        )
+
+
+def test_page_cache_hits_and_view_latency(post_with_published_location):
+    cache.clear()
+    misses = _value("blog_cache_requests_total", cache="page", result="miss")
+    hits = _value("blog_cache_requests_total", cache="page", result="hit")
+    latency = _value("blog_view_duration_seconds", view="PostListView")
+    count = sum(latency[:-1]) if latency else 0
+    client = Client()
+    client.get("/")
+    client.get("/")
+    assert _value(
+        "blog_cache_requests_total", cache="page", result="miss",
+    ) == misses + 1
+    assert _value(
+        "blog_cache_requests_total", cache="page", result="hit",
+    ) == hits + 1, (
+        "Убедитесь, что обращения к кэшу страниц учитываются в метриках."
+    )
+    latency = _value("blog_view_duration_seconds", view="PostListView")
+    assert sum(latency[:-1]) == count + 2, (
+        "Убедитесь, что время ответа учитывается по классу view."
+    )
+
+
+def test_metrics_are_merged_across_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "snapshot", lambda: [
+        ["blog_posts_created_total", (), 1],
+    ])
+    (tmp_path / "1.json").write_text(json.dumps([
+        ["blog_posts_created_total", [], 2],
+        ["blog_image_upload_bytes", [], [1, 0, 0, 0, 0, 0, 1000]],
+    ]))
+    (tmp_path / "2.json").write_text(json.dumps([
+        ["blog_posts_created_total", [], 3],
+        ["blog_image_upload_bytes", [], [0, 1, 0, 0, 0, 0, 100000]],
+    ]))
+    with override_settings(METRICS_DIR=str(tmp_path)):
+        merged = collect()
+        text = render(merged)
+    assert merged[("blog_posts_created_total", ())] == 6, (
+        "Убедитесь, что счётчики разных процессов складываются."
+    )
+    assert 'blog_image_upload_bytes_bucket{le="65536"} 1' in text
+    assert 'blog_image_upload_bytes_bucket{le="262144"} 2' in text
+    assert "blog_image_upload_bytes_count 2" in text
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", ""])
+    process.wait()
+    return process.pid
+
+
+def test_dead_process_snapshots_are_retired(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "snapshot", lambda: [])
+    live = tmp_path / f"{os.getpid()}-1.json"
+    dead = tmp_path / f"{_dead_pid()}-2.json"
+    for path, value in ((live, 1), (dead, 2)):
+        path.write_text(json.dumps([["blog_posts_created_total", [], value]]))
+    with override_settings(METRICS_DIR=str(tmp_path)):
+        metrics.retire_snapshots()
+        assert not dead.exists() and live.exists(), (
+            "Убедитесь, что снимки завершившихся процессов удаляются,"
+            " а снимки работающих остаются."
+        )
+        assert collect()[("blog_posts_created_total", ())] == 3, (
+            "Убедитесь, что метрики завершившихся процессов сохраняются"
+            " в общем файле и счётчики не убывают."
+        )
+        dead.write_text(json.dumps([["blog_posts_created_total", [], 2]]))
+        retired = json.loads((tmp_path / "retired.json").read_text())
+        assert retired["folded"] == [dead.stem]
+        assert collect()[("blog_posts_created_total", ())] == 3, (
+            "Убедитесь, что неудалённый снимок, уже сложенный в общий файл,"
+            " не учитывается дважды."
+        )
+        metrics.retire_snapshots()
+        assert not dead.exists()
+        assert collect()[("blog_posts_created_total", ())] == 3
+
+
+def test_metrics_are_flushed_in_background(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_FLUSH_INTERVAL", 0.01)
+    process = metrics.Registry()
+    with override_settings(METRICS_DIR=str(tmp_path)):
+        process.inc("blog_posts_created_total")
+        deadline = time.monotonic() + 5
+        while not list(tmp_path.glob("*.json")) and (
+            time.monotonic() < deadline
+        ):
+            time.sleep(0.01)
+        process.close()
+    files = list(tmp_path.glob("*.json"))
+    assert [path.stem for path in files] == [process.name], (
+        "Убедитесь, что метрики процесса записываются фоновым потоком"
+        " без входящих запросов."
+    )
+    assert process.name.startswith(f"{os.getpid()}-")
+    assert json.loads(files[0].read_text()) == [
+        ["blog_posts_created_total", [], 1],
+    ]
+
+
+def test_metrics_endpoint_is_internal(post_with_published_location):
+    with override_settings(METRICS_ALLOWED_IPS=["127.0.0.1"]):
+        response = Client().get("/metrics/")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE blog_view_duration_seconds histogram" in (
+        response.content.decode()
+    )
+    with override_settings(METRICS_ALLOWED_IPS=[], METRICS_TOKEN="secret"):
+        assert Client().get("/metrics/").status_code == 404, (
+            "Убедитесь, что метрики недоступны с адресов вне"
+            " METRICS_ALLOWED_IPS, в том числе через прокси на 127.0.0.1."
+        )
+        assert Client(HTTP_AUTHORIZATION="Bearer wrong").get(
+            "/metrics/",
+        ).status_code == 404
+        assert Client(HTTP_AUTHORIZATION="Bearer secret").get(
+            "/metrics/",
+        ).status_code == 200, (
+            "Убедитесь, что метрики доступны с токеном METRICS_TOKEN."
+        )
@@ -0,0 +1,87 @@
+import re
+
+import pytest
+from django.test.client import Client
+
+from blog.cache import FEED_GROUP, invalidate
+from blog.models import Post
+from blog.paginators import CachedCountPaginator
+from blog.views import PostListView
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def cursor_pagination(monkeypatch):
+    monkeypatch.setattr(PostListView, "cursor_pagination", True)
+
+
+def _page_ids(response) -> list:
+    return [post.id for post in response.context["page_obj"]]
+
+
+def test_cursor_pagination_walks_feed(
+        cursor_pagination, many_posts_with_published_locations,
+        client: Client):
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    first = client.get("/")
+    assert _page_ids(first) == [post.id for post in expected[:N_PER_PAGE]]
+    next_link = re.search(r'href="(\?after=[^"]+)"', first.content.decode())
+    assert next_link, (
+        "Убедитесь, что в режиме курсорной пагинации на странице есть ссылка"
+        " на следующую страницу."
+    )
+
+    second = client.get("/" + next_link.group(1))
+    assert _page_ids(second) == [
+        post.id for post in expected[N_PER_PAGE:N_PER_PAGE * 2]
+    ]
+    assert not second.context["page_obj"].has_next()
+
+    before = second.context["page_obj"].previous_cursor
+    back = client.get("/", {"before": before})
+    assert _page_ids(back) == _page_ids(first)
+
+
+def test_cursor_pagination_rejects_broken_cursor(
+        cursor_pagination, client: Client):
+    assert client.get("/", {"after": "not-a-cursor"}).status_code == 404
+
+
+def test_cached_count_paginator_reuses_count(
+        many_posts_with_published_locations, django_assert_num_queries):
+    queryset = Post.published_posts.all()
+    groups = (FEED_GROUP,)
+    with django_assert_num_queries(1):
+        count = CachedCountPaginator(queryset, N_PER_PAGE, groups).count
+    with django_assert_num_queries(0):
+        assert CachedCountPaginator(
+            queryset, N_PER_PAGE, groups
+        ).count == count, (
+            "Убедитесь, что пагинатор ленты берёт число публикаций из кэша."
+        )
+    invalidate(FEED_GROUP)
+    with django_assert_num_queries(1):
+        CachedCountPaginator(queryset, N_PER_PAGE, groups).count
+
+
+def test_page_range_is_windowed(mixer, user, published_category):
+    mixer.cycle(N_PER_PAGE * 30).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date="2000-01-01T00:00:00Z",
+    )
+    response = Client().get("/", {"page": 15})
+    content = response.content.decode()
+    links = set(re.findall(r'href="\?page=(\d+)"', content))
+    assert links == {"1", "12", "13", "14", "16", "17", "18", "30"}, (
+        "Убедитесь, что пагинатор выводит только первую, последнюю и"
+        " соседние с текущей страницы."
+    )
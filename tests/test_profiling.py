@@ -0,0 +1,35 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.test.client import Client
+
+pytestmark = [pytest.mark.django_db]
+
+
+@override_settings(TEMPLATE_PROFILING=True)
+def test_server_timing_reports_templates_and_includes(
+        many_posts_with_published_locations):
+    cache.clear()
+    response = Client().get("/")
+    assert response.status_code == 200
+    header = response.get("Server-Timing", "")
+    assert header.startswith("db;dur="), (
+        "Убедитесь, что при включённом TEMPLATE_PROFILING ответ содержит"
+        " заголовок Server-Timing со временем запросов к БД."
+    )
+    assert 'desc="blog/index.html 1x"' in header
+    assert 'desc="includes/post_card.html 10x"' in header, (
+        "Убедитесь, что в Server-Timing учитывается каждая отрисовка"
+        " включаемого шаблона."
+    )
+    assert 'blog/index.html:8 includes/post_card.html 10x' in header, (
+        "Убедитесь, что время тега include указывается вместе с шаблоном"
+        " и строкой, где он стоит."
+    )
+
+
+def test_no_server_timing_by_default(post_with_published_location):
+    response = Client().get("/")
+    assert "Server-Timing" not in response, (
+        "Убедитесь, что профилирование шаблонов выключено по умолчанию."
+    )
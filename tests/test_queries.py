@@ -0,0 +1,84 @@
+import pytest
+from django.db.models import Model
+from django.test.client import Client
+
+from blogicum.constants import COMMENTS_BY_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+# Сессия и пользователь для авторизованных запросов.
+AUTH_QUERIES = 2
+
+
+@pytest.mark.parametrize(
+    ("client_name", "extra_queries"),
+    [
+        ("unlogged_client", 0),
+        ("another_user_client", AUTH_QUERIES),
+        ("user_client", AUTH_QUERIES),
+    ],
+    ids=["anonymous", "non-author", "author"],
+)
+def test_post_detail_queries(
+        request, client_name: str, extra_queries: int,
+        post_with_published_location: Model,
+        django_assert_num_queries):
+    client: Client = request.getfixturevalue(client_name)
+    with django_assert_num_queries(2 + extra_queries):
+        response = client.get(f"/posts/{post_with_published_location.id}/")
+    assert response.status_code == 200
+
+
+def test_post_detail_comments_queries(
+        mixer, another_user_client: Client,
+        post_with_published_location: Model,
+        django_assert_num_queries):
+    mixer.cycle(COMMENTS_BY_PAGE + 5).blend(
+        "blog.Comment", post=post_with_published_location
+    )
+    url = f"/posts/{post_with_published_location.id}/"
+    with django_assert_num_queries(AUTH_QUERIES + 3):
+        response = another_user_client.get(url)
+    assert len(response.context["comments"]) == COMMENTS_BY_PAGE, (
+        "Убедитесь, что комментарии на странице публикации выводятся"
+        " порциями."
+    )
+    response = another_user_client.get(url, {"comments_page": 2})
+    assert len(response.context["comments"]) == 5
+
+
+def test_unpublished_post_detail_queries(
+        user_client: Client, another_user_client: Client,
+        unpublished_posts_with_published_locations,
+        django_assert_num_queries):
+    post = unpublished_posts_with_published_locations[0]
+    with django_assert_num_queries(AUTH_QUERIES + 1):
+        response = another_user_client.get(f"/posts/{post.id}/")
+    assert response.status_code == 404
+    with django_assert_num_queries(AUTH_QUERIES + 2):
+        response = user_client.get(f"/posts/{post.id}/")
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize(
+    ("client_name", "extra_queries"),
+    [
+        ("unlogged_client", 0),
+        ("another_user_client", AUTH_QUERIES),
+        ("user_client", AUTH_QUERIES),
+    ],
+    ids=["anonymous", "visitor", "owner"],
+)
+def test_profile_queries(
+        request, client_name: str, extra_queries: int, user: Model,
+        many_posts_with_published_locations, django_assert_num_queries):
+    client: Client = request.getfixturevalue(client_name)
+    # Пользователь, COUNT публикаций и страница публикаций.
+    with django_assert_num_queries(3 + extra_queries) as captured:
+        response = client.get(f"/profile/{user.username}/")
+    assert response.status_code == 200
+    assert not any(
+        "auth_user" in query["sql"].split("WHERE")[-1]
+        for query in captured.captured_queries
+        if "blog_post" in query["sql"]
+    ), "Убедитесь, что публикации профиля отбираются по id автора."
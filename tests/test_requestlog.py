@@ -0,0 +1,71 @@
+import json
+import logging
+
+import pytest
+from django.test import override_settings
+from django.test.client import Client
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def request_log(caplog):
+    logger = logging.getLogger("blogicum.requestlog")
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+def _records(caplog) -> list:
+    return [
+        (record.levelno, json.loads(record.getMessage()))
+        for record in caplog.records
+        if record.name == "blogicum.requestlog"
+    ]
+
+
+@override_settings(REQUEST_LOG=True, REQUEST_LOG_SAMPLE_RATE=1.0)
+def test_request_log_line(request_log, post_with_published_location):
+    response = Client().get("/")
+    records = _records(request_log)
+    assert len(records) == 1, (
+        "Убедитесь, что на каждый запрос к странице пишется одна строка"
+        " журнала."
+    )
+    level, record = records[0]
+    assert level == logging.INFO
+    assert record["view"] == "blog:index"
+    assert record["status"] == 200
+    assert record["bytes"] == len(response.content)
+    assert record["queries"] > 0, (
+        "Убедитесь, что в журнал попадает число запросов к БД."
+    )
+    for key in ("duration_ms", "query_ms", "render_ms"):
+        assert record[key] >= 0
+    assert record["render_ms"] > 0
+
+
+@override_settings(
+    REQUEST_LOG=True, REQUEST_LOG_SAMPLE_RATE=0.0, REQUEST_LOG_SLOW_MS=0)
+def test_slow_requests_bypass_sampling(request_log):
+    Client().get("/pages/about/")
+    records = _records(request_log)
+    assert [(level, record["view"], record["slow"])
+            for level, record in records] == [
+        (logging.WARNING, "pages:about", True)
+    ], (
+        "Убедитесь, что медленные запросы пишутся в журнал независимо"
+        " от выборки."
+    )
+
+
+@override_settings(REQUEST_LOG=True, REQUEST_LOG_SAMPLE_RATE=0.0)
+def test_sampled_out_and_foreign_requests_are_skipped(request_log):
+    Client().get("/")
+    with override_settings(REQUEST_LOG_SAMPLE_RATE=1.0):
+        Client().get("/api/posts/")
+        Client().get("/no-such-page/")
+    assert _records(request_log) == [], (
+        "Убедитесь, что в журнал не попадают запросы вне выборки"
+        " и вне пространств имён `blog` и `pages`."
+    )
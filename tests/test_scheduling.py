@@ -0,0 +1,71 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core import serializers
+from django.core.management import call_command
+from django.test.client import Client
+from django.utils import timezone
+
+from blog.models import Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_future_posts_are_not_live(future_posts):
+    assert not Post.objects.filter(is_live=True).exists(), (
+        "Убедитесь, что публикации с датой в будущем не попадают в эфир"
+        " при сохранении."
+    )
+    assert not Post.published_posts.exists()
+
+
+def test_publish_scheduled_command(future_posts, client: Client):
+    post = future_posts[0]
+    client.get("/")
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    assert post.title not in client.get("/").content.decode()
+
+    call_command("publish_scheduled", stdout=StringIO())
+
+    assert Post.objects.get(pk=post.pk).is_live
+    assert post.title in client.get("/").content.decode(), (
+        "Убедитесь, что после перевода отложенной публикации в эфир"
+        " кэш ленты сбрасывается."
+    )
+    assert Post.objects.filter(is_live=False).count() == len(future_posts) - 1
+
+
+def test_moving_pub_date_to_future_hides_post(
+        post_with_published_location):
+    post = post_with_published_location
+    post.pub_date = timezone.now() + timedelta(days=1)
+    post.save()
+    assert not Post.published_posts.filter(pk=post.pk).exists()
+
+
+def test_partial_save_updates_is_live(post_with_published_location):
+    post = post_with_published_location
+    post.pub_date = timezone.now() + timedelta(days=1)
+    post.save(update_fields=["pub_date"])
+    assert not Post.objects.get(pk=post.pk).is_live, (
+        "Убедитесь, что `save(update_fields=...)` пересчитывает `is_live`."
+    )
+
+
+def test_loaddata_sets_is_live(post_with_published_location, tmp_path):
+    post = post_with_published_location
+    data = json.loads(serializers.serialize("json", [post]))
+    data[0]["fields"]["pub_date"] = (
+        timezone.now() + timedelta(days=1)
+    ).isoformat()
+    data[0]["fields"]["is_live"] = True
+    fixture = tmp_path / "posts.json"
+    fixture.write_text(json.dumps(data), encoding="utf-8")
+    call_command("loaddata", str(fixture), stdout=StringIO())
+    assert not Post.objects.get(pk=post.pk).is_live, (
+        "Убедитесь, что `is_live` вычисляется и при загрузке фикстур."
+    )
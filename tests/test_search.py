@@ -0,0 +1,141 @@
+import re
+from datetime import timedelta
+from html import unescape
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Model
+from django.test.client import Client
+from django.utils import timezone
+
+from blog import search
+from blog.models import Post
+from blog.search import SEARCH_TABLE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _found_ids_on_page(response) -> list:
+    assert response.status_code == 200
+    return [post.id for post in response.context["page_obj"]]
+
+
+def _found_ids(client: Client, query: str) -> list:
+    return _found_ids_on_page(client.get("/search/", {"q": query}))
+
+
+def test_search_finds_title_and_text(
+        client: Client, post_with_published_location: Model):
+    post = post_with_published_location
+    post.title = "Восхождение на Эльбрус"
+    post.text = "Снаряжение, акклиматизация и погода."
+    post.save()
+    assert _found_ids(client, "эльбрус") == [post.id], (
+        "Убедитесь, что поиск находит публикацию по слову из заголовка."
+    )
+    assert _found_ids(client, "акклиматиз*") == [post.id], (
+        "Убедитесь, что поиск находит публикацию по началу слова из текста."
+    )
+    assert _found_ids(client, "акклиматиз") == [], (
+        "Убедитесь, что слово без звёздочки ищется целиком."
+    )
+    assert _found_ids(client, "Эльбрус погода") == [post.id]
+    assert _found_ids(client, "Эльбрус Казбек") == []
+    assert _found_ids(client, "") == []
+
+
+def test_search_hides_unpublished(
+        client: Client, unpublished_posts_with_published_locations):
+    post = unpublished_posts_with_published_locations[0]
+    post.title = "Черновик про Байкал"
+    post.save()
+    assert _found_ids(client, "Байкал") == [], (
+        "Убедитесь, что поиск не показывает снятые с публикации записи."
+    )
+
+
+def test_search_index_follows_edits(
+        client: Client, post_with_published_location: Model,
+        django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    post.title = "Алтай"
+    post.save()
+    post.title = "Карелия"
+    post.save()
+    assert _found_ids(client, "Алтай") == [], (
+        "Убедитесь, что после редактирования публикации поисковый индекс"
+        " обновляется."
+    )
+    assert _found_ids(client, "Карелия") == [post.id]
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert _found_ids(client, "Карелия") == []
+
+
+def test_rebuild_search_index(
+        client: Client, post_with_published_location: Model):
+    post = post_with_published_location
+    post.title = "Камчатка"
+    post.save()
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+    assert _found_ids(client, "Камчатка") == []
+    call_command("rebuild_search_index", stdout=StringIO())
+    assert _found_ids(client, "Камчатка") == [post.id], (
+        "Убедитесь, что команда rebuild_search_index заново наполняет"
+        " поисковый индекс."
+    )
+
+
+@pytest.fixture
+def baikal_posts(monkeypatch, many_posts_with_published_locations) -> list:
+    """Совпадения, у которых порядок дат обратен порядку pk."""
+    monkeypatch.setattr(search, "SEARCH_CHUNK_SIZE", 2)
+    posts = sorted(many_posts_with_published_locations, key=lambda p: p.pk)
+    now = timezone.now()
+    for index, post in enumerate(posts):
+        post.title = "Байкал"
+        post.pub_date = now - timedelta(days=index + 1)
+        post.is_published = index % 3 != 0
+        post.save()
+    return [post for post in posts if post.is_published]
+
+
+def _search_link(response, cursor: str) -> str:
+    link = re.search(
+        rf'href="(\?q=[^"]*{cursor}=[^"]+)"', response.content.decode(),
+    )
+    return "/search/" + unescape(link.group(1)) if link else None
+
+
+def test_search_pages_follow_pub_date(client: Client, baikal_posts: list):
+    pages = []
+    url = "/search/?q=Байкал"
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        pages.append([post.id for post in response.context["page_obj"]])
+        url = _search_link(response, "after")
+    assert sum(pages, []) == [post.id for post in baikal_posts], (
+        "Убедитесь, что результаты поиска идут от новых публикаций к старым,"
+        " без скрытых записей, и листаются до конца."
+    )
+    assert len(pages) > 1
+    response = client.get(_search_link(response, "before"))
+    assert _found_ids_on_page(response) == pages[-2]
+
+
+def test_search_limit_keeps_newest(
+        monkeypatch, baikal_posts: list):
+    monkeypatch.setattr(search, "MAX_SEARCH_RESULTS", 3)
+    found = search.get_search_backend().search(
+        Post.published_posts.all(), ["Байкал"],
+    )
+    assert {post.id for post in found} == {
+        post.id for post in baikal_posts[:3]
+    }, (
+        "Убедитесь, что ограничение числа результатов поиска оставляет самые"
+        " новые видимые публикации."
+    )
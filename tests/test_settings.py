@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / "blogicum"
+
+
+def _import_settings(**env) -> subprocess.CompletedProcess:
+    environ = {
+        key: value for key, value in os.environ.items()
+        if key not in (
+            "DJANGO_SECRET_KEY",
+            "DJANGO_CACHE_BACKEND",
+            "DJANGO_CACHE_LOCATION",
+        )
+    }
+    return subprocess.run(
+        [sys.executable, "-c", "import blogicum.settings"],
+        cwd=PROJECT_DIR,
+        env={**environ, "BLOGICUM_ENV": "production", **env},
+        capture_output=True,
+        text=True,
+    )
+
+
+@pytest.mark.parametrize(("env", "setting"), [
+    ({}, "DJANGO_SECRET_KEY"),
+    ({"DJANGO_SECRET_KEY": "secret"}, "DJANGO_CACHE_LOCATION"),
+    ({
+        "DJANGO_SECRET_KEY": "secret",
+        "DJANGO_CACHE_LOCATION": "127.0.0.1:11211",
+        "DJANGO_CACHE_BACKEND":
+            "django.core.cache.backends.locmem.LocMemCache",
+    }, "LocMemCache"),
+])
+def test_production_refuses_unsafe_settings(env: dict, setting: str):
+    result = _import_settings(**env)
+    assert result.returncode != 0, (
+        f"Убедитесь, что в production настройки с небезопасным {setting}"
+        " не загружаются."
+    )
+    assert "ImproperlyConfigured" in result.stderr
+    assert setting in result.stderr
+
+
+def test_production_settings_load():
+    assert _import_settings(
+        DJANGO_SECRET_KEY="secret",
+        DJANGO_CACHE_LOCATION="/var/cache/blogicum",
+    ).returncode == 0
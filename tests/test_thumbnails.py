@@ -0,0 +1,84 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.files.storage import default_storage
+from django.db.models import Model
+from django.test.client import Client
+from PIL import Image
+
+from blog.models import Post
+from blog.thumbnails import (IMAGE_FORMATS, IMAGE_VARIANTS,
+                             generate_image_variants, variant_name,
+                             variant_names)
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_generate_image_variants(
+        post_with_published_location: Model, client: Client):
+    post = post_with_published_location
+    generate_image_variants(post.id)
+
+    post = Post.objects.get(pk=post.id)
+    assert post.has_image_variants
+    for variant, size in IMAGE_VARIANTS.items():
+        for extension in IMAGE_FORMATS:
+            name = variant_name(post.image.name, variant, extension)
+            with default_storage.open(name) as file:
+                image = Image.open(file)
+                assert image.width <= size[0] and image.height <= size[1]
+
+    thumb_url = default_storage.url(
+        variant_name(post.image.name, "thumb", "webp")
+    )
+    assert thumb_url in client.get("/").content.decode(), (
+        "Убедитесь, что в ленте выводится уменьшенная копия фото."
+    )
+
+
+def _variants_exist(name: str) -> list:
+    return [default_storage.exists(variant) for variant in variant_names(name)]
+
+
+def test_old_image_variants_are_deleted(
+        post_with_published_location: Model,
+        django_capture_on_commit_callbacks):
+    post = post_with_published_location
+    generate_image_variants(post.id)
+    post.refresh_from_db()
+    old_name = post.image.name
+    buffer = BytesIO()
+    Image.new("RGB", (50, 50)).save(buffer, format="JPEG")
+    post.image = ImageFile(buffer, name="replaced.jpg")
+    post.save()
+    generate_image_variants(post.id)
+    post.refresh_from_db()
+    assert post.has_image_variants
+    assert all(_variants_exist(post.image.name))
+    assert not any(_variants_exist(old_name)), (
+        "Убедитесь, что после замены фото уменьшенные копии прежнего фото"
+        " удаляются."
+    )
+
+    new_name = post.image.name
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert not any(_variants_exist(new_name)), (
+        "Убедитесь, что при удалении публикации удаляются уменьшенные"
+        " копии её фото."
+    )
+
+
+def test_removed_image_variants_are_deleted(
+        post_with_published_location: Model):
+    post = post_with_published_location
+    generate_image_variants(post.id)
+    name = post.image.name
+    Post.objects.filter(pk=post.id).update(image="")
+    generate_image_variants(post.id)
+    assert not any(_variants_exist(name)), (
+        "Убедитесь, что после удаления фото из публикации удаляются его"
+        " уменьшенные копии."
+    )
+    assert Post.objects.get(pk=post.id).image_variants_source == ""
@@ -0,0 +1,53 @@
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.template import engines
+from django.test import override_settings
+
+from blogicum.warmup import template_names, uses_cached_loader, warm_templates
+
+CACHED_TEMPLATES = [{
+    **settings.TEMPLATES[0],
+    "OPTIONS": {
+        **settings.TEMPLATES[0]["OPTIONS"],
+        "loaders": [(
+            "django.template.loaders.cached.Loader",
+            settings.TEMPLATE_LOADERS,
+        )],
+    },
+}]
+
+
+def test_template_names_cover_templates_dir():
+    names = template_names()
+    for name in (
+        "base.html",
+        "includes/header.html",
+        "includes/post_card.html",
+        "includes/paginator.html",
+    ):
+        assert name in names, (
+            f"Убедитесь, что прогрев шаблонов включает `{name}`."
+        )
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+def test_warm_templates_fills_cached_loader():
+    assert uses_cached_loader()
+    timings = warm_templates()
+    assert [name for name, _ in timings] == template_names()
+    assert all(seconds >= 0 for _, seconds in timings)
+    loader = engines["django"].engine.template_loaders[0]
+    assert "includes/post_card.html" in loader.get_template_cache, (
+        "Убедитесь, что после прогрева скомпилированные шаблоны хранятся"
+        " в кэширующем загрузчике."
+    )
+
+
+def test_warm_templates_command_reports_timings():
+    out = StringIO()
+    call_command("warm_templates", stdout=out, stderr=StringIO())
+    output = out.getvalue()
+    assert "base.html" in output
+    assert f"Скомпилировано шаблонов: {len(template_names())}" in output